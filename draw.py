@@ -3,11 +3,11 @@
 This module is the entry point for the application.
 """
 
-from src.graph_utils import convert_grid_to_graph
 from src.display_maze import Drawer
-from networkx import from_edgelist  # type: ignore
+from src.graph_generation import load_maze
 from sys import argv
 from os.path import isfile
+import json
 
 
 if __name__ == "__main__":
@@ -17,13 +17,11 @@ if __name__ == "__main__":
     ITERATIONS = 3
     ANTS = 20
 
-    if isfile("data/settings.txt"):
-        with open("data/settings.txt", "r") as s:
-            ROWS, COLS, ITERATIONS, ANTS = eval(s.read())
+    if isfile("data/settings.json"):
+        with open("data/settings.json", "r") as s:
+            ROWS, COLS, ITERATIONS, ANTS = json.load(s)
 
-    with open("data/maze.txt", "r") as m:
-        maze = from_edgelist(eval(m.read()))
-    graph = convert_grid_to_graph(maze)
+    maze, ROWS, COLS = load_maze("data/maze.npz")
 
     if len(argv) > 1:
         drawer = Drawer(
@@ -5,10 +5,15 @@ This module is the entry point for the application.
 
 from src.path_finding import AntColonyOptimization
 from src.evaluation import compare_with_dijkstra
-from src.graph_generation import generate_maze
+from src.aco_strategies import PheromoneBasedMoveSelection
+from src.graph_generation import generate_maze, generate_maze_cached
+from src.graph_generation import save_maze
 from src.graph_utils import convert_grid_to_graph, node_tuple_to_int
-from networkx import to_edgelist  # type: ignore
+from src.graph_utils import convert_graph_to_csr
 from sys import argv
+import json
+import os
+import secrets
 
 
 if __name__ == "__main__":
@@ -17,6 +22,7 @@ if __name__ == "__main__":
     COLS = 10
     ITERATIONS = 3
     ANTS = 20
+    SEED = None
 
     if len(argv) > 1:
         ROWS = int(argv[1])
@@ -25,14 +31,26 @@ if __name__ == "__main__":
         ITERATIONS = int(argv[2])
     elif len(argv) > 3:
         ANTS = int(argv[3])
+    if len(argv) > 4:
+        SEED = int(argv[4])
 
-    with open("data/settings.txt", "w") as s:
-        s.write(str((ROWS, COLS, ITERATIONS, ANTS)))
+    os.makedirs("data", exist_ok=True)
+    with open("data/settings.json", "w") as s:
+        json.dump([ROWS, COLS, ITERATIONS, ANTS], s)
 
-    maze = generate_maze(ROWS, COLS)
-    with open("data/maze.txt", "w") as m:
-        m.write(str(to_edgelist(maze)))
-    graph = convert_grid_to_graph(maze)
+    if SEED is None:
+        # every run gets a fresh maze, the seed is printed, so the run
+        # can be repeated by passing it
+        SEED = secrets.randbits(32)
+        maze = generate_maze(ROWS, COLS, seed=SEED)
+    else:
+        # mazes are reproducible for a given seed and cached on disk,
+        # so the repeated runs skip the generation
+        maze = generate_maze_cached(ROWS, COLS, SEED)
+    print(f"Seed: {SEED}")
+    save_maze("data/maze.npz", maze, ROWS, COLS)
+    # the CSR representation is shared by ACO and Dijkstra's algorithm
+    graph = convert_graph_to_csr(convert_grid_to_graph(maze, COLS))
 
     aco = AntColonyOptimization(
         graph,
@@ -43,6 +61,7 @@ if __name__ == "__main__":
         decay=0.5,
         alpha=1,
         beta=1,
+        move_selection_strategy=PheromoneBasedMoveSelection(seed=SEED),
     )
 
     upper_right_corner = node_tuple_to_int((0, COLS - 1), COLS)
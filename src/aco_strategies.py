@@ -7,10 +7,12 @@ to find the shortest-paths in a graph.
 # mypy: no_implicit_optional = False
 
 from abc import ABC, abstractmethod
-from typing import List, Tuple, Dict, Set
-import networkx as nx  # type: ignore
+from typing import List, Tuple
+from numba import njit, prange  # type: ignore
 import numpy as np
 
+from .graph_utils import CSRGraph
+
 
 class MoveSelectionStrategy(ABC):
     """
@@ -21,15 +23,97 @@ class MoveSelectionStrategy(ABC):
     @abstractmethod
     def select_move(
         self,
-        graph: nx.Graph,
-        pheromone: Dict[Tuple[int, int], float],
-        explored: Set[int],
+        graph: CSRGraph,
+        pheromone: np.ndarray,
+        explored: np.ndarray,
         current_node: int,
         alpha: float,
         beta: float,
     ) -> int:
         pass
 
+    def construct_path(
+        self,
+        graph: CSRGraph,
+        pheromone: np.ndarray,
+        start: int,
+        end: int,
+        alpha: float,
+        beta: float,
+    ) -> np.ndarray:
+        """
+        Constructs a single path for an ant from the start node to the
+        end node by running a randomized DFS driven by select_move.
+
+        Parameters:
+            graph: The graph on which the ants are moving.
+            pheromone: An array containing pheromone levels for
+                each edge in the graph indexed by the edge id.
+            start: The start node.
+            end: The end node.
+            alpha: The influence of the pheromone levels on the move decision.
+            beta: The influence of the heuristic information on the move
+                decision.
+
+        Returns:
+            Array of type int32 with the path constructed by the ant,
+            it is empty if the end node is unreachable.
+        """
+        explored = np.zeros(graph.number_of_nodes, dtype=np.bool_)
+
+        # the DFS stack holds the path from the start node to the node
+        # being explored, so it is the path once the end node is reached
+        stack = [start]
+        explored[start] = True
+        while stack:
+            node = stack[-1]
+            if node == end:
+                break
+
+            v = self.select_move(graph, pheromone, explored, node, alpha, beta)
+            if v == -1:
+                # dead end, go back to the previous node
+                stack.pop()
+            else:
+                explored[v] = True
+                stack.append(v)
+
+        return np.array(stack, dtype=np.int32)
+
+    def construct_colony_paths(
+        self,
+        graph: CSRGraph,
+        pheromone: np.ndarray,
+        n_ants: int,
+        start: int,
+        end: int,
+        alpha: float,
+        beta: float,
+    ) -> List[np.ndarray]:
+        """
+        Constructs paths for all ants in the colony from the start node
+        to the end node. The ants only read the pheromone levels, so the
+        paths are independent of each other.
+
+        Parameters:
+            graph: The graph on which the ants are moving.
+            pheromone: An array containing pheromone levels for
+                each edge in the graph indexed by the edge id.
+            n_ants: The number of ants in the colony.
+            start: The start node.
+            end: The end node.
+            alpha: The influence of the pheromone levels on the move decision.
+            beta: The influence of the heuristic information on the move
+                decision.
+
+        Returns:
+            Arrays of type int32 with the paths constructed by the ants.
+        """
+        return [
+            self.construct_path(graph, pheromone, start, end, alpha, beta)
+            for _ in range(n_ants)
+        ]
+
 
 class PheromoneUpdateStrategy(ABC):
     """
@@ -40,20 +124,121 @@ class PheromoneUpdateStrategy(ABC):
     @abstractmethod
     def update_pheromone(
         self,
-        pheromone: Dict[Tuple[int, int], float],
-        paths: List[Tuple[List[int], int]],
+        graph: CSRGraph,
+        pheromone: np.ndarray,
+        paths: List[Tuple[np.ndarray, int]],
         decay: float,
         n_best: int,
-    ) -> Dict[Tuple[int, int], float]:
+    ) -> np.ndarray:
         pass
 
 
 class PheromoneBasedMoveSelection(MoveSelectionStrategy):
+    def __init__(self, seed: int = None):
+        """
+        Parameters:
+            seed: Seed of the random number generator driving the moves
+                (for reproducibility).
+        """
+        self.rng = np.random.default_rng(seed)
+        # explored bitmaps of the ants are reused between the walks,
+        # every ant clears its row before it starts walking
+        self._explored = np.empty((0, 0), dtype=np.bool_)
+        # the node degree heuristic depends only on the graph and beta,
+        # so it is computed once and reused by all steps of all ants
+        self._heuristic_degree = np.empty(0, dtype=np.int32)
+        self._heuristic_beta = 0.0
+        self._heuristic = np.empty(0)
+        # pheromone levels raised to alpha, recomputed for every colony
+        # since the levels change between the iterations
+        self._weights = np.empty(0)
+
+    def _explored_buffer(self, n_ants: int, n_nodes: int) -> np.ndarray:
+        """
+        Retrieve a buffer with one explored bitmap per ant.
+
+        Parameters:
+            n_ants: The number of ants.
+            n_nodes: The number of nodes in the graph.
+
+        Returns:
+            Boolean array of shape (n_ants, n_nodes).
+        """
+        if self._explored.shape != (n_ants, n_nodes):
+            self._explored = np.empty((n_ants, n_nodes), dtype=np.bool_)
+        return self._explored
+
+    def _attractiveness(self, graph: CSRGraph, beta: float) -> np.ndarray:
+        """
+        Retrieve the heuristic information of the nodes, the nodes with
+        fewer neighbors are more attractive.
+
+        Parameters:
+            graph: The graph on which the ants are moving.
+            beta: The influence of the heuristic information on the move
+                decision.
+
+        Returns:
+            Array of length N with 1 / degree ** beta of each node.
+        """
+        if (
+            self._heuristic_degree is not graph.degree
+            or self._heuristic_beta != beta
+        ):
+            # isolated nodes are never a move, so their infinite
+            # attractiveness is never used
+            with np.errstate(divide="ignore"):
+                self._heuristic = np.power(
+                    graph.degree.astype(np.float64), -float(beta)
+                )
+            self._heuristic_degree = graph.degree
+            self._heuristic_beta = beta
+        return self._heuristic
+
+    def _pheromone_weights(
+        self,
+        pheromone: np.ndarray,
+        alpha: float,
+    ) -> np.ndarray:
+        """
+        Raise the pheromone levels to the power of alpha once, so the
+        walks do not compute the power on every step.
+
+        Parameters:
+            pheromone: An array containing pheromone levels for
+                each edge in the graph indexed by the edge id.
+            alpha: The influence of the pheromone levels on the move decision.
+
+        Returns:
+            Array with pheromone ** alpha of each edge, the pheromone
+            levels themselves if alpha is 1.
+        """
+        if alpha == 1:
+            return pheromone
+        if self._weights.shape != pheromone.shape:
+            self._weights = np.empty(pheromone.shape)
+        return np.power(pheromone, alpha, out=self._weights)
+
+    def _walk_seeds(self, n_ants: int) -> np.ndarray:
+        """
+        Draw the seeds of the walks of the ants from the generator of
+        the strategy. The compiled kernels cannot use the generator, so
+        every walk seeds the random number generator of the thread it
+        runs on, and the result does not depend on the thread scheduling.
+
+        Parameters:
+            n_ants: The number of ants.
+
+        Returns:
+            Array with one seed per ant.
+        """
+        return self.rng.integers(0, 2**31 - 1, size=n_ants)
+
     def select_move(
         self,
-        graph: nx.Graph,
-        pheromone: Dict[Tuple[int, int], float],
-        explored: Set[int],
+        graph: CSRGraph,
+        pheromone: np.ndarray,
+        explored: np.ndarray,
         current_node: int,
         alpha: float,
         beta: float,
@@ -64,90 +249,143 @@ class PheromoneBasedMoveSelection(MoveSelectionStrategy):
 
         Parameters:
             graph: The graph on which the ants are moving.
-            pheromone: A dictionary containing pheromone levels for
-                each edge in the graph.
-            explored: A set of already explored nodes that allows
-                the algorithm to guide the selection process more efficiently.
+            pheromone: An array containing pheromone levels for
+                each edge in the graph indexed by the edge id.
+            explored: A boolean array marking already explored nodes that
+                allows the algorithm to guide the selection process more
+                efficiently.
             current_node: The current node where the ant is located.
             alpha: The influence of the pheromone levels on the move decision.
             beta: The influence of the heuristic information (node degree)
                 on the move decision.
 
         Returns:
-            The next node to move to.
-        """
-        # retrieve edges connected to the current node
-        edges = graph.edges(current_node)
-
-        neighbors = []
-        pheromone_list = []
-        for edge in edges:
-            neighbor = edge[1] if edge[0] == current_node else edge[0]
-            neighbors.append(neighbor)
-            # calulate pheromone values for each edge adjusted by
-            # alpha parameter
-            pheromone_value = get_pheromone_value(pheromone, edge) ** alpha
-            pheromone_list.append(pheromone_value)
-
-        pheromone_values = np.array(pheromone_list)
-
-        # here we use the node degree heuristic
-        # (number of edges connected to it)
-        # this means that the nodes with fewer connections have a higher
-        # heuristic value, the parameter beta controls the influence of this
-        # heuristic i.e. a higher value of beta gives more importance to this
-        # heuristic in the decision-making process for edge selection
-        # calculate the heuristic value for each neighboring node adjusted by
-        # beta
-        attractiveness = np.array(
-            [1.0 / graph.degree(neighbor) ** beta for neighbor in neighbors]
+            The next node to move to or -1 if all neighbors of the current
+            node were already explored.
+        """
+        return _select_move(
+            graph.indptr,
+            graph.indices,
+            graph.edge_ids,
+            self._attractiveness(graph, beta),
+            pheromone,
+            explored,
+            current_node,
+            float(alpha),
+            self.rng.random(),
         )
 
-        # use pheromone and attractiveness to calculate edge selection
-        # probabilities
-        probabilities = pheromone_values * attractiveness
-        probabilities /= probabilities.sum()
+    def construct_path(
+        self,
+        graph: CSRGraph,
+        pheromone: np.ndarray,
+        start: int,
+        end: int,
+        alpha: float,
+        beta: float,
+    ) -> np.ndarray:
+        """
+        Constructs a single path for an ant from the start node to the
+        end node. The whole walk runs in a compiled kernel giving the
+        same result as the select_move driven DFS of the base class.
 
-        # we want to prioritize nodes that have not already been explored
-        # only if all of them were explored so that we hit a dead end we
-        # decide to choose an already explored node
+        Parameters:
+            graph: The graph on which the ants are moving.
+            pheromone: An array containing pheromone levels for
+                each edge in the graph indexed by the edge id.
+            start: The start node.
+            end: The end node.
+            alpha: The influence of the pheromone levels on the move decision.
+            beta: The influence of the heuristic information on the move
+                decision.
 
-        # filter out already explored nodes
-        unexplored_neighbors = [n for n in neighbors if n not in explored]
-        if unexplored_neighbors:
-            unexplored_probabilities = np.array(
-                [
-                    probabilities[neighbors.index(n)]
-                    for n in unexplored_neighbors
-                ]
-            )
-            # normalize the remaining probability values so that the sigma
-            # additivity holds for the entire sample space
-            unexplored_probabilities /= unexplored_probabilities.sum()
-            move = np.random.choice(
-                unexplored_neighbors, p=unexplored_probabilities
-            )
-        else:
-            move = None
+        Returns:
+            Array of type int32 with the path constructed by the ant,
+            it is empty if the end node is unreachable.
+        """
+        explored = self._explored_buffer(1, graph.number_of_nodes)[0]
+        # a DFS path never visits a node twice
+        path = np.empty(graph.number_of_nodes, dtype=np.int32)
+        size = _ant_walk(
+            graph.indptr,
+            graph.indices,
+            graph.edge_ids,
+            self._attractiveness(graph, beta),
+            self._pheromone_weights(pheromone, alpha),
+            start,
+            end,
+            self._walk_seeds(1)[0],
+            explored,
+            path,
+        )
+        return path[:size]
+
+    def construct_colony_paths(
+        self,
+        graph: CSRGraph,
+        pheromone: np.ndarray,
+        n_ants: int,
+        start: int,
+        end: int,
+        alpha: float,
+        beta: float,
+    ) -> List[np.ndarray]:
+        """
+        Constructs paths for all ants in the colony from the start node
+        to the end node. The walks of the ants run in parallel in
+        a compiled kernel.
+
+        Parameters:
+            graph: The graph on which the ants are moving.
+            pheromone: An array containing pheromone levels for
+                each edge in the graph indexed by the edge id.
+            n_ants: The number of ants in the colony.
+            start: The start node.
+            end: The end node.
+            alpha: The influence of the pheromone levels on the move decision.
+            beta: The influence of the heuristic information on the move
+                decision.
 
-        return move
+        Returns:
+            Arrays of type int32 with the paths constructed by the ants,
+            they are views of a single (n_ants, N) array.
+        """
+        paths = np.empty((n_ants, graph.number_of_nodes), dtype=np.int32)
+        sizes = np.empty(n_ants, dtype=np.int32)
+        _colony_walk(
+            graph.indptr,
+            graph.indices,
+            graph.edge_ids,
+            self._attractiveness(graph, beta),
+            self._pheromone_weights(pheromone, alpha),
+            start,
+            end,
+            self._walk_seeds(n_ants),
+            self._explored_buffer(n_ants, graph.number_of_nodes),
+            paths,
+            sizes,
+        )
+        return [path[:size] for path, size in zip(paths, sizes)]
 
 
 class BasicPheromoneUpdate(PheromoneUpdateStrategy):
     def update_pheromone(
         self,
-        pheromone: Dict[Tuple[int, int], float],
-        paths: List[Tuple[List[int], int]],
+        graph: CSRGraph,
+        pheromone: np.ndarray,
+        paths: List[Tuple[np.ndarray, int]],
         decay: float,
         n_best: int,
-    ) -> Dict[Tuple[int, int], float]:
+    ) -> np.ndarray:
         """
         Updates the pheromone levels on the graph edges based on
         the paths found by the ants.
 
         Parameters:
-            pheromone: A dictionary containing the current pheromone levels
-                for each edge in the graph.
+            graph: The graph on which the ants are moving.
+            pheromone: An array containing the current pheromone levels
+                for each edge in the graph indexed by the edge id. The array
+                is updated in place.
             paths: A list of tuples where each tuple contains a path and
                 its length.
             decay: The decay factor applied to the pheromones to simulate
@@ -157,58 +395,193 @@ class BasicPheromoneUpdate(PheromoneUpdateStrategy):
         Returns:
             The updated pheromone levels for each edge in the graph.
         """
+        # apply pheromone decay
+        # reducing the pheromone levels on all edges to simulate
+        # the natural evaporation of pheromones over time
+        pheromone *= decay
+
         # sort paths by their length is ascending order
         sorted_paths = sorted(paths, key=lambda x: x[1])
         # update pheromone levels on the best paths
         # we add more pheromone to edges that are part of the
-        # best paths found by the ants
-        for path, length in sorted_paths[:n_best]:
-            for move in zip(path[:-1], path[1:]):
-                set_pheromone_value(
-                    pheromone,
-                    move,
-                    get_pheromone_value(pheromone, move) + 1.0 / length,
-                )
-        # apply pheromone decay
-        # reducing the pheromone levels on all edges to simulate
-        # the natural evaporation of pheromones over time
-        pheromone = {k: v * decay for k, v in pheromone.items()}
+        # best paths found by the ants, the deposits evaporate
+        # in the same iteration so they are scaled by the decay
+        # paths without edges deposit nothing, the end node is either
+        # the start node or it is unreachable and the path is empty
+        best_paths = [
+            (path, length)
+            for path, length in sorted_paths[:n_best]
+            if len(path) > 1
+        ]
+        if best_paths:
+            # the edges of all best paths are gathered at once, a DFS
+            # path does not repeat edges but different paths can share them
+            edge_ids = np.concatenate(
+                [
+                    graph.edge_ids_between(path[:-1], path[1:])
+                    for path, _ in best_paths
+                ]
+            )
+            amounts = np.repeat(
+                [decay / length for _, length in best_paths],
+                [len(path) - 1 for path, _ in best_paths],
+            )
+            np.add.at(pheromone, edge_ids, amounts)
+
         return pheromone
 
 
-# The necessity of this function stems from the way that NetworkX represents
-# undirected graphs, where we are not sure whether the edge between two
-# nodes u and v is stored as (u, v) or (v, u).
-def get_pheromone_value(
-    pheromone: Dict[Tuple[int, int], float], edge: Tuple[int, int]
-) -> float:
+# The functions below are compiled with Numba since they are called for
+# every step of every ant and work on tiny arrays (the degree of a node
+# in a maze is at most 4), so the interpreter and NumPy dispatch overhead
+# would dominate the actual computation.
+@njit(cache=True, fastmath=True)
+def _select_move(
+    indptr: np.ndarray,
+    indices: np.ndarray,
+    edge_ids: np.ndarray,
+    attractiveness: np.ndarray,
+    pheromone: np.ndarray,
+    explored: np.ndarray,
+    current_node: int,
+    alpha: float,
+    draw: float,
+) -> int:
     """
-    Retrieve the pheromone value.
+    Select the next move for an ant, see PheromoneBasedMoveSelection.
+    The draw is a uniform random number from [0, 1) deciding the move.
 
-    Parameters:
-        pheromone: Dictionary containg pheromone values for each edge.
-        edge: Edge used for retrieval.
+    Returns:
+        The next node to move to or -1 if all neighbors of the current
+        node were already explored.
+    """
+    start = indptr[current_node]
+    stop = indptr[current_node + 1]
+
+    # the weight of a move combines the pheromone level of the edge
+    # adjusted by alpha with the attractiveness of the neighbor,
+    # explored nodes are skipped so they are never chosen
+    #
+    # the move is sampled in a single pass: the k-th unexplored neighbor
+    # replaces the current choice with probability weight / total, where
+    # total sums the weights seen so far, and the draw is rescaled to stay
+    # uniform on the branch taken, so one draw decides all replacements
+    total = 0.0
+    zeros = 0
+    move = -1
+    for k in range(start, stop):
+        neighbor = indices[k]
+        if explored[neighbor]:
+            continue
+
+        weight = pheromone[edge_ids[k]]
+        if alpha != 1.0:
+            weight **= alpha
+        weight *= attractiveness[neighbor]
+        total += weight
+        if total == 0.0:
+            # moves are uniform while all the weights are zero, the k-th
+            # of them replaces the current choice with probability 1 / k
+            zeros += 1
+            probability = 1.0 / zeros
+        else:
+            probability = weight / total
+
+        if draw < probability:
+            move = neighbor
+            draw /= probability
+        else:
+            draw = (draw - probability) / (1.0 - probability)
+
+    return move
+
+
+@njit(cache=True, fastmath=True)
+def _ant_walk(
+    indptr: np.ndarray,
+    indices: np.ndarray,
+    edge_ids: np.ndarray,
+    attractiveness: np.ndarray,
+    weights: np.ndarray,
+    start: int,
+    end: int,
+    seed: int,
+    explored: np.ndarray,
+    path: np.ndarray,
+) -> int:
+    """
+    Construct a path with a randomized DFS. The path buffer doubles as the
+    DFS stack: an ant extends it with the selected move and pops nodes
+    with no unexplored neighbors when it has to backtrack. The random
+    number generator of the thread is seeded with the given seed.
+    The weights hold the pheromone levels already raised to alpha.
 
     Returns:
-        Pheromone value for the edge.
+        The number of nodes of the path written to the path buffer,
+        0 if the end node is unreachable.
     """
-    u, v = edge
-    return pheromone[(u, v)] if (u, v) in pheromone else pheromone[(v, u)]
+    np.random.seed(seed)
+    explored.fill(False)
+    explored[start] = True
+    path[0] = start
+    size = 1
 
+    while size > 0:
+        node = path[size - 1]
+        if node == end:
+            return size
 
-# The reasoning is similar to get_pheromone_value function.
-def set_pheromone_value(
-    pheromone: Dict[Tuple[int, int], float],
-    edge: Tuple[int, int],
-    value: float,
+        move = _select_move(
+            indptr,
+            indices,
+            edge_ids,
+            attractiveness,
+            weights,
+            explored,
+            node,
+            1.0,
+            np.random.random(),
+        )
+        if move == -1:
+            size -= 1
+        else:
+            explored[move] = True
+            path[size] = move
+            size += 1
+
+    return 0
+
+
+@njit(cache=True, fastmath=True, parallel=True)
+def _colony_walk(
+    indptr: np.ndarray,
+    indices: np.ndarray,
+    edge_ids: np.ndarray,
+    attractiveness: np.ndarray,
+    weights: np.ndarray,
+    start: int,
+    end: int,
+    seeds: np.ndarray,
+    explored: np.ndarray,
+    paths: np.ndarray,
+    sizes: np.ndarray,
 ):
     """
-    Set the pheromone value provided.
-
-    Parameters:
-        pheromone: Dictionary containg pheromone values for each edge.
-        edge: Edge used for updating.
-        value: Value to set for the edge.
+    Construct the paths of all ants in parallel. The path of the i-th ant
+    is written to the first sizes[i] entries of the i-th row of paths,
+    the i-th row of explored is used as its explored bitmap.
     """
-    u, v = edge
-    pheromone[(u, v) if (u, v) in pheromone else (v, u)] = value
+    for ant in prange(len(seeds)):
+        sizes[ant] = _ant_walk(
+            indptr,
+            indices,
+            edge_ids,
+            attractiveness,
+            weights,
+            start,
+            end,
+            seeds[ant],
+            explored[ant],
+            paths[ant],
+        )
+
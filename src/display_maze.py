@@ -7,12 +7,14 @@ with the ants exploring it trying to find the shortest path.
 """
 
 import networkx as nx  # type: ignore
+import numpy as np
 import pygame  # type: ignore
-from collections import Counter
+from functools import lru_cache
+from itertools import chain
 from pygame.color import THECOLORS as c
-from time import sleep
-from typing import List, Tuple, Dict
-from math import exp
+from numba import njit  # type: ignore
+import os
+from typing import Dict, List, Optional, Tuple
 
 from src.state_loader import (
     load_state_by_iteration,
@@ -20,11 +22,17 @@ from src.state_loader import (
 )
 
 Color = Tuple[int, int, int, int]
+# (E, 2) array of the endpoints of the edges and the array of their
+# pheromone levels
+Pheromone = Tuple[np.ndarray, np.ndarray]
 
 
 DEFAULT_BORDER_COLOR = c["black"]
 DEFAULT_SLEEP_TIME = 0.5
 
+# Number of parsed states kept in memory by the display loop
+STATE_CACHE_SIZE = 8
+
 
 class Drawer:
     """
@@ -48,6 +56,23 @@ class Drawer:
         self.width, self.height = cols * cell_size, rows * cell_size
         self.t_delta = t_delta
 
+        # pixel coordinates of the cell centers indexed by node id,
+        # so drawing a path takes one lookup instead of a divmod per node
+        node_rows, node_cols = np.divmod(np.arange(rows * cols), cols)
+        self.corners = np.stack(
+            (node_cols * cell_size, node_rows * cell_size), axis=-1
+        )
+        self.half_cell = cell_size / 2
+        self.centers = self.corners + self.half_cell
+
+        # sizes of the drawn elements depend only on the cell size,
+        # so they are computed once
+        self.border_width = int(cell_size / 10)
+        self.pheromone_width = int(cell_size / 8)
+        self.path_width = int(cell_size / 6)
+        self.path_box_start = int(cell_size / 12) - 1
+        self.path_circle_size = self.path_width * 3 + 1
+
     def setup(
         self,
         maze: nx.Graph,
@@ -62,28 +87,46 @@ class Drawer:
             Nothing
         """
 
+        # use the SIMD alpha blitters of SDL instead of the ones of pygame
+        os.environ.setdefault("PYGAME_BLEND_ALPHA_SDL2", "1")
         pygame.init()
         pygame.font.init()
         self.font = pygame.font.SysFont("Comic Sans MS", 16)
+        self._count_surfaces: Dict[int, pygame.Surface] = {}
+        self.clock = pygame.time.Clock()
 
         self.screen = pygame.display.set_mode((self.width, self.height))
+        pygame.display.set_caption("Maze")
+        # the surfaces are converted to the pixel format of the window,
+        # so blitting them does not convert their pixels every time
         self.ant_image = pygame.image.load("antcolony.png")
         self.ant_image = pygame.transform.scale(
-            self.ant_image, (self.cell_size / 2, self.cell_size / 2)
-        )
+            self.ant_image, (self.half_cell, self.half_cell)
+        ).convert_alpha()
 
-        pygame.display.set_caption("Maze")
         self.screen.fill(c["white"])
 
         self.edges = maze.edges()
+        # the connectivity of the cells is computed once, so redrawing
+        # the maze does not touch the NetworkX graph
+        self._right, self._down = self._connectivity()
         # self.maze = maze
-        self.maze_surface = pygame.surface.Surface((self.width, self.height))
+        self.maze_surface = pygame.surface.Surface(
+            (self.width, self.height)
+        ).convert()
         self._draw_maze()
 
+        # pheromone levels are drawn onto a transparent overlay, so the
+        # cached maze surface stays intact and the overlay is redrawn
+        # only when the levels change
+        self.pheromone_surface = pygame.surface.Surface(
+            (self.width, self.height), pygame.SRCALPHA, 32
+        ).convert_alpha()
+        self._drawn_pheromone: Optional[Pheromone] = None
+
         self.ant_surface = pygame.surface.Surface(
             (self.width, self.height), pygame.SRCALPHA, 32
         )
-        self.ant_surface.convert_alpha()
 
     def draw_maze(self):
         self.screen.blit(self.maze_surface, (0, 0))
@@ -107,108 +150,160 @@ class Drawer:
         """
 
         self.maze_surface.fill(c["white"])
-        full = nx.grid_2d_graph(self.rows, self.cols)
-
-        for u, v in full.edges():
-            if (u, v) not in self.edges:
-                if u[0] == v[0]:  # horizontal
-                    x1 = (
-                        u[1] + v[1]
-                    ) * self.cell_size / 2 + self.cell_size / 2
-                    x2 = x1
-                    y1 = (
-                        u[0] + v[0] - 1
-                    ) * self.cell_size / 2 + self.cell_size / 2
-                    y2 = y1 + self.cell_size
-
-                else:  # vertical
-                    x1 = (
-                        u[1] + v[1] - 1
-                    ) * self.cell_size / 2 + self.cell_size / 2
-                    x2 = x1 + self.cell_size
-                    y1 = (
-                        u[0] + v[0]
-                    ) * self.cell_size / 2 + self.cell_size / 2
-                    y2 = y1
-
-                # draw wall
-                pygame.draw.line(
-                    self.maze_surface, c["black"], (x1, y1), (x2, y2), 2
-                )
-
-        # border
-        border_width = int(self.cell_size / 10)
-        pygame.draw.line(
-            self.maze_surface,
-            DEFAULT_BORDER_COLOR,
-            (0, 0),
-            (0, self.height - self.cell_size),
-            border_width,
-        )
-        pygame.draw.line(
-            self.maze_surface,
-            DEFAULT_BORDER_COLOR,
-            (0, 0),
-            (self.width, 0),
-            border_width,
+
+        # draw walls, the runs are horizontal or vertical, so they are
+        # written straight into the pixels instead of one draw call each
+        pixels = pygame.surfarray.pixels2d(self.maze_surface)
+        _fill_segments(
+            pixels, self._wall_runs(), self.maze_surface.map_rgb(c["black"])
         )
-        pygame.draw.line(
+        # the surface stays locked while the pixel array exists
+        del pixels
+
+        # border with the entrance in the lower left corner and the exit
+        # in the upper right corner
+        self.maze_surface.lock()
+        pygame.draw.lines(
             self.maze_surface,
             DEFAULT_BORDER_COLOR,
-            (0, self.height - 1),
-            (self.width, self.height - 1),
-            border_width,
+            False,
+            [(0, self.height - self.cell_size), (0, 0), (self.width, 0)],
+            self.border_width,
         )
-        pygame.draw.line(
+        pygame.draw.lines(
             self.maze_surface,
             DEFAULT_BORDER_COLOR,
-            (self.width - 1, self.cell_size),
-            (self.width - 1, self.height),
-            border_width,
+            False,
+            [
+                (self.width - 1, self.cell_size),
+                (self.width - 1, self.height - 1),
+                (0, self.height - 1),
+            ],
+            self.border_width,
         )
+        self.maze_surface.unlock()
+
+    def _connectivity(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Compute which adjacent cells of the maze are connected.
 
-        # update
-        pygame.display.flip()
+        Returns:
+            Boolean arrays right and down of shape (rows, cols), where
+            right[row, col] and down[row, col] tell if the cell is
+            connected to its right and lower neighbor respectively.
+        """
+        right = np.zeros((self.rows, self.cols), dtype=np.bool_)
+        down = np.zeros((self.rows, self.cols), dtype=np.bool_)
+
+        # the cells of an edge differ in one coordinate only, so the
+        # element-wise minimum of its end points is the upper left cell
+        ends = np.array(list(self.edges), dtype=np.int64).reshape(-1, 2, 2)
+        first, second = ends.min(axis=1), ends.max(axis=1)
+        horizontal = first[:, 0] == second[:, 0]
+        right[first[horizontal, 0], first[horizontal, 1]] = True
+        down[first[~horizontal, 0], first[~horizontal, 1]] = True
+
+        return right, down
+
+    def _wall_runs(self) -> np.ndarray:
+        """
+        Compute the walls of the maze merged into straight runs.
+
+        A wall separates two adjacent cells that are not connected by
+        an edge. Walls in the same line that touch each other are merged
+        into a single segment, so drawing the maze takes one write
+        per run instead of one per wall.
+
+        Returns:
+            Array of shape (N, 2, 2) with the start and end points
+            of the runs.
+        """
+        return _wall_segments(self._right, self._down, self.cell_size)
 
     def draw_pheromone(
         self,
-        pheromone: Dict[Tuple[int, int], float],
+        pheromone: Pheromone,
         color: Color = c["red"],
     ):
         """
         Draw pheromone levels in maze
 
         Args:
-            pheromone: level of pheromone on visited edges
+            pheromone: edges and their levels of pheromone
             color: color of path to draw
 
         Returns:
             Nothing
         """
-        max_pheromone = max(pheromone.values())
-
-        for k, v in pheromone.items():
-            uy, ux = divmod(k[0], self.cols)
-            vy, vx = divmod(k[1], self.cols)
-            intensity = 1.0 - v / max_pheromone
+        self._update_pheromone_overlay(pheromone)
+        self.screen.blit(self.pheromone_surface, (0, 0))
 
+    def _update_pheromone_overlay(self, pheromone: Pheromone):
+        """
+        Redraw the pheromone overlay if the levels differ from the ones
+        drawn on it.
+        """
+        drawn = self._drawn_pheromone
+        # the frames of an iteration share the arrays of its state
+        if drawn is None or not all(
+            new is old or np.array_equal(new, old)
+            for new, old in zip(pheromone, drawn)
+        ):
+            self._draw_pheromone_overlay(pheromone)
+            self._drawn_pheromone = pheromone
+
+    def _draw_pheromone_overlay(self, pheromone: Pheromone):
+        self.pheromone_surface.fill((0, 0, 0, 0))
+
+        # the shades and end points of all lines are computed at once
+        edges, levels = pheromone
+        intensity = 1.0 - levels / levels.max()
+        shades = (255 * intensity).astype(np.int64)
+        points = self.centers[edges]
+        line_width = self.pheromone_width
+
+        # lines outside the surface are not passed to pygame at all
+        visible = self._visible(points[:, 0], points[:, 1], line_width)
+        # the surface is locked once instead of once per line
+        self.pheromone_surface.lock()
+        for shade, (start, end) in zip(
+            shades[visible].tolist(), points[visible].tolist()
+        ):
             pygame.draw.line(
-                self.maze_surface,
-                (
-                    int(255 * intensity),
-                    int(255 * intensity),
-                    int(255 * intensity),
-                ),
-                (
-                    ux * self.cell_size + self.cell_size / 2,
-                    uy * self.cell_size + self.cell_size / 2,
-                ),
-                (
-                    vx * self.cell_size + self.cell_size / 2,
-                    vy * self.cell_size + self.cell_size / 2,
-                ),
-                int(self.cell_size / 8),
+                self.pheromone_surface,
+                (shade, shade, shade),
+                start,
+                end,
+                line_width,
             )
+        self.pheromone_surface.unlock()
+
+    def _visible(
+        self,
+        starts: np.ndarray,
+        ends: np.ndarray,
+        line_width: int,
+    ) -> np.ndarray:
+        """
+        Check which lines intersect the screen.
+
+        Args:
+            starts: start points of the lines
+            ends: end points of the lines
+            line_width: width of the lines
+
+        Returns:
+            Boolean mask of the lines whose bounding boxes intersect
+            the screen
+        """
+        low = np.minimum(starts, ends) - line_width
+        high = np.maximum(starts, ends) + line_width
+        return (
+            (high[:, 0] >= 0)
+            & (low[:, 0] < self.width)
+            & (high[:, 1] >= 0)
+            & (low[:, 1] < self.height)
+        )
 
     def draw_path(
         self,
@@ -218,7 +313,8 @@ class Drawer:
         draw_ends: bool = False,
     ):
         """
-        Draw path through maze
+        Draw path through maze, the path is shown in the window with
+        the next frame
 
         Args:
             path: list of vertices constituting a path
@@ -230,160 +326,155 @@ class Drawer:
             Nothing
         """
         # parameters
-        line_width = int(self.cell_size / 6)
-        box_start = int(self.cell_size / 12) - 1
-        circle_size = line_width * 3 + 1
+        line_width = self.path_width
+        box_start = self.path_box_start
+        circle_size = self.path_circle_size
 
-        # first point
-        u = path[0]
-        uy, ux = divmod(u, self.cols)
+        points = self.centers[np.asarray(path)]
 
         # circle at start
         if draw_ends:
-            pygame.draw.ellipse(
-                self.screen,
-                color,
-                (
-                    (
-                        self.cell_size * (ux + 1 / 2) - circle_size / 2,
-                        self.cell_size * (uy + 1 / 2) - circle_size / 2,
-                    ),
-                    (circle_size, circle_size),
-                ),
+            self._draw_path_end(points[0], color, circle_size)
+
+        if dash:  # dashed line
+            # segments stop at the border of the cell they lead to
+            starts = points[:-1]
+            ends = points[1:] - np.sign(points[1:] - starts) * self.half_cell
+            visible = self._visible(starts, ends, line_width)
+            self.screen.lock()
+            for start, end in zip(
+                starts[visible].tolist(), ends[visible].tolist()
+            ):
+                pygame.draw.line(self.screen, color, start, end, line_width)
+            self.screen.unlock()
+        elif len(points) > 1:  # normal line
+            # the whole path is drawn in a single call
+            pygame.draw.lines(
+                self.screen, color, False, points.tolist(), line_width
             )
 
-        for i in range(1, len(path)):
-            v = path[i]
-
-            # start and end position in graph
-            vy, vx = divmod(v, self.cols)
-
-            # start position in gui
-            x1 = self.cell_size / 2 + ux * self.cell_size
-            y1 = self.cell_size / 2 + uy * self.cell_size
-
-            # end position in gui
-            x2: float
-            y2: float
-            if dash:  # dashed line
-                if vx == ux:
-                    x2 = vx * self.cell_size + self.cell_size / 2
-                    if vy > uy:
-                        y2 = vy * self.cell_size
-                    else:
-                        y2 = vy * self.cell_size + self.cell_size
-                else:
-                    if vx > ux:
-                        x2 = vx * self.cell_size
-                    else:
-                        x2 = vx * self.cell_size + self.cell_size
-                    y2 = vy * self.cell_size + self.cell_size / 2
-            else:  # normal line
-                x2 = vx * self.cell_size + self.cell_size / 2
-                y2 = vy * self.cell_size + self.cell_size / 2
-
-            # draw line
-            pygame.draw.line(
-                self.screen, color, (x1, y1), (x2, y2), line_width
-            )
-
-            # rect for making line smooth
-            pygame.draw.rect(
-                self.screen,
-                color,
-                (
-                    (x1 - box_start, y1 - box_start),
-                    (line_width, line_width),
-                ),
-            )
-
-            # make current vertex previous
-            u = v
-            uy, ux = divmod(u, self.cols)
+        # rects for making line smooth, all of them are blitted
+        # in one call from a single square of the color of the path
+        square = pygame.surface.Surface((line_width, line_width))
+        square.fill(color)
+        corners = (points[:-1] - box_start).astype(np.int64).tolist()
+        self.screen.blits(
+            [(square, corner) for corner in corners], doreturn=False
+        )
 
         # circle at end
         if draw_ends:
-            pygame.draw.ellipse(
-                self.screen,
-                color,
-                (
-                    (
-                        self.cell_size * (vx + 1 / 2) - circle_size / 2,
-                        self.cell_size * (vy + 1 / 2) - circle_size / 2,
-                    ),
-                    (
-                        circle_size,
-                        circle_size,
-                    ),
-                ),
-            )
+            self._draw_path_end(points[-1], color, circle_size)
 
-        # same square as before
-        pygame.display.flip()
+    def _draw_path_end(
+        self,
+        center: np.ndarray,
+        color: Color,
+        circle_size: int,
+    ):
+        x, y = center - circle_size / 2
+        pygame.draw.ellipse(
+            self.screen, color, ((x, y), (circle_size, circle_size))
+        )
 
     def draw_ants(
         self,
-        paths: List[List[int]],
+        paths: np.ndarray,
         iter: int,
         color: Color = c["black"],
-    ):
+    ) -> List[pygame.Rect]:
         """
         Draw ants going through maze in one iteration
 
         Args:
-            paths: paths of ants
+            paths: paths of ants padded with -1 to the same length,
+                see _pad_paths
             iter: number of current iteration
             color: ant color
 
         Returns:
-            Nothing
+            Areas of the screen covered by the ants and their counts
         """
 
-        ant_size = self.cell_size / 4
-        ants = [path[iter] for path in paths if len(path) > iter]
-        ant_counts = Counter(ants)
+        ants = paths[:, iter]
+        ant_counts = np.bincount(
+            ants[ants >= 0], minlength=self.rows * self.cols
+        )
+
+        # only the occupied cells are drawn
+        cells = np.flatnonzero(ant_counts)
+        centers = self.centers[cells].tolist()
+        corners = self.corners[cells].tolist()
 
-        for ant, cnt in ant_counts.items():
-            uy, ux = divmod(ant, self.cols)
-            self._draw_ant_count(cnt, ux, uy)
-            self._draw_ant(ant_size, color, ux, uy)
+        sprites = []
+        counts = ant_counts[cells].tolist()
+        for cnt, center, corner in zip(counts, centers, corners):
+            sprites.append((self._ant_count_surface(cnt), center))
+            sprites.append((self.ant_image, corner))
 
-    def _draw_ant(
+        # the counts and the images are drawn in one call, the images
+        # do not overlap the counts in the cell centers
+        return self.screen.blits(sprites)
+
+    def _ant_count_surface(self, cnt: int) -> pygame.Surface:
+        """
+        Retrieve the rendered text of an ant count. The counts are small
+        and repeat across frames, so every count is rendered only once.
+        """
+        if cnt not in self._count_surfaces:
+            self._count_surfaces[cnt] = self.font.render(
+                f"{cnt}", False, (0, 0, 0)
+            ).convert_alpha()
+        return self._count_surfaces[cnt]
+
+    def _draw_frame(
         self,
-        ant_size: float,
-        color: Color,
-        ux: int,
-        uy: int,
-        dot: bool = True,
+        paths: np.ndarray,
+        pheromones: Pheromone,
+        iter: int,
     ):
-        if dot:
-            self.screen.blit(
-                self.ant_image, (ux * self.cell_size, uy * self.cell_size)
+        """
+        Draw a frame of the animation and show it in the window.
+
+        Only the ants move within an iteration, so after its first frame
+        only the areas covered by the ants in the previous and the current
+        frame are redrawn and updated in the window.
+
+        Args:
+            paths: paths of ants padded with -1 to the same length
+            pheromones: edges and their levels of pheromone
+            iter: number of the frame within the iteration
+
+        Returns:
+            Nothing
+        """
+        if iter == 0:
+            # the maze and the overlay are composed with a single call
+            self._update_pheromone_overlay(pheromones)
+            self.screen.blits(
+                [
+                    (self.maze_surface, (0, 0)),
+                    (self.pheromone_surface, (0, 0)),
+                ],
+                False,
             )
+            self._ant_areas = self.draw_ants(paths, iter)
+            pygame.display.flip()
             return
 
-        pygame.draw.ellipse(
-            self.screen,
-            color,
-            (
-                (
-                    self.cell_size * (ux + 1 / 2) - ant_size / 2,
-                    self.cell_size * (uy + 1 / 2) - ant_size / 2,
-                ),
-                (ant_size, ant_size),
-            ),
+        # erase the ants of the previous frame
+        self.screen.blits(
+            [
+                (surface, area, area)
+                for area in self._ant_areas
+                for surface in (self.maze_surface, self.pheromone_surface)
+            ],
+            False,
         )
 
-    def _draw_ant_count(
-        self,
-        cnt: int,
-        ux: int,
-        uy: int,
-    ):
-        x = self.cell_size / 2 + ux * self.cell_size
-        y = self.cell_size / 2 + uy * self.cell_size
-        text_surface = self.font.render(f"{cnt}", False, (0, 0, 0))
-        self.screen.blit(text_surface, (x, y))
+        ant_areas = self.draw_ants(paths, iter)
+        pygame.display.update(self._ant_areas + ant_areas)
+        self._ant_areas = ant_areas
 
     def draw(
         self,
@@ -403,29 +494,16 @@ class Drawer:
         """
 
         end = False
+        modified = os.stat(file_path).st_mtime_ns
+        # a delay of zero does not limit the frame rate
+        framerate = 1 / self.t_delta if self.t_delta > 0 else 0
 
         for i in range(iterations):
-            state = load_state_by_iteration(file_path, i)
-
-            paths = state["all_paths"]
-            paths = [path["path"] for path in paths]
-            longest = max(len(path) for path in paths)
-
-            pheromone = state["pheromone"]
-
-            def getNumbers(s: str) -> Tuple[int, int]:
-                t = tuple(map(int, s.split("-")))
-                return (t[0], t[1])
-
-            pheromones: Dict[Tuple[int, int], float] = {
-                getNumbers(k): float(v) for k, v in pheromone.items()
-            }
+            paths, pheromones = _load_frame_data(file_path, modified, i)
+            longest = paths.shape[1]
 
             for i in range(longest):
-                self.draw_maze()
-                self.draw_pheromone(pheromones)
-                self.draw_ants(paths, i)
-                pygame.display.flip()
+                self._draw_frame(paths, pheromones, i)
 
                 for event in pygame.event.get():
                     if event.type == pygame.QUIT:
@@ -434,9 +512,148 @@ class Drawer:
 
                 if end:
                     break
-                sleep(self.t_delta)
+                # the time spent on drawing the frame counts towards
+                # the delay between the frames
+                self.clock.tick(framerate)
 
             if end:
                 break
 
         pygame.quit()
+
+
+@lru_cache(maxsize=STATE_CACHE_SIZE)
+def _load_frame_data(
+    file_path: str,
+    modified: int,
+    iteration: int,
+) -> Tuple[np.ndarray, Pheromone]:
+    """
+    Load the state of an iteration and parse it to the form used for
+    drawing. Results are memoized, so replaying an iteration does not
+    read the file again.
+
+    Args:
+        file_path: path to file containing saved states of algorithm
+        modified: modification time of the file, so the states saved
+            by a new run of the algorithm are not served from the cache
+        iteration: number of the iteration
+
+    Returns:
+        The paths of the ants padded with -1, see _pad_paths, and
+        the edges with their pheromone levels. They are shared
+        between the calls, so they must not be modified.
+    """
+    state = load_state_by_iteration(
+        file_path, iteration, pheromone_arrays=True
+    )
+    paths = _pad_paths([path["path"] for path in state["all_paths"]])
+    return paths, state["pheromone"]
+
+
+def _pad_paths(paths: List[List[int]]) -> np.ndarray:
+    """
+    Store paths of different lengths in one array.
+
+    Args:
+        paths: list of paths
+
+    Returns:
+        Array of type int32 of shape (len(paths), longest path length),
+        the i-th row holds the i-th path padded with -1.
+    """
+    lengths = np.fromiter(map(len, paths), dtype=np.int64, count=len(paths))
+    nodes = np.fromiter(
+        chain.from_iterable(paths), dtype=np.int32, count=lengths.sum()
+    )
+
+    # the rows are filled in one assignment, the mask selects the first
+    # lengths[i] entries of the i-th row in row-major order
+    padded = np.full((len(paths), lengths.max()), -1, dtype=np.int32)
+    padded[np.arange(padded.shape[1]) < lengths[:, None]] = nodes
+    return padded
+
+
+@njit(cache=True)
+def _wall_segments(
+    right: np.ndarray,
+    down: np.ndarray,
+    cell_size: int,
+) -> np.ndarray:
+    """
+    Compute the wall runs of a maze, see Drawer._wall_runs.
+
+    Args:
+        right: connectivity of the cells to their right neighbors
+        down: connectivity of the cells to their lower neighbors
+        cell_size: size of a cell in pixels
+
+    Returns:
+        Array of type int32 of shape (N, 2, 2) with the start and end
+        points of the runs.
+    """
+    rows, cols = right.shape
+    # there are never more runs than walls
+    segments = np.empty(
+        (max(rows * (cols - 1) + (rows - 1) * cols, 0), 2, 2), dtype=np.int32
+    )
+    n = 0
+
+    # vertical walls between horizontally adjacent cells
+    for col in range(cols - 1):
+        x = (col + 1) * cell_size
+        first = -1
+        for row in range(rows + 1):
+            wall = row < rows and not right[row, col]
+            if wall and first == -1:
+                first = row
+            elif not wall and first != -1:
+                segments[n, 0, 0] = x
+                segments[n, 0, 1] = first * cell_size
+                segments[n, 1, 0] = x
+                segments[n, 1, 1] = row * cell_size
+                n += 1
+                first = -1
+
+    # horizontal walls between vertically adjacent cells
+    for row in range(rows - 1):
+        y = (row + 1) * cell_size
+        first = -1
+        for col in range(cols + 1):
+            wall = col < cols and not down[row, col]
+            if wall and first == -1:
+                first = col
+            elif not wall and first != -1:
+                segments[n, 0, 0] = first * cell_size
+                segments[n, 0, 1] = y
+                segments[n, 1, 0] = col * cell_size
+                segments[n, 1, 1] = y
+                n += 1
+                first = -1
+
+    return segments[:n]
+
+
+@njit(cache=True)
+def _fill_segments(
+    pixels: np.ndarray,
+    segments: np.ndarray,
+    color: int,
+):
+    """
+    Draw horizontal and vertical lines of width 2 into a pixel array,
+    the pixels match the ones of pygame.draw.line.
+
+    Args:
+        pixels: pixels of the surface indexed by x and y
+        segments: array of shape (N, 2, 2) with the start and end
+            points of the lines
+        color: mapped color of the lines
+    """
+    for i in range(len(segments)):
+        x1, y1 = segments[i, 0]
+        x2, y2 = segments[i, 1]
+        if y1 == y2:
+            pixels[min(x1, x2) : max(x1, x2) + 1, y1 : y1 + 2] = color
+        else:
+            pixels[x1 : x1 + 2, min(y1, y2) : max(y1, y2) + 1] = color
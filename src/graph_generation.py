@@ -8,15 +8,26 @@ random structure and edge weights.
 # mypy: no_implicit_optional = False
 
 import networkx as nx  # type: ignore
+from numba import njit  # type: ignore
 import numpy as np
-import random
-from typing import Optional
+import os
+from typing import NamedTuple, Optional, Tuple, Union
 
 
 # Number of edges added to the graph during maze
 # generation to create cycles
 NEW_EDGES_FRAC = 0.015
 
+# Offsets of the neighbors of a cell in the maze
+NEIGHBOR_OFFSETS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+
+# Directory holding the mazes generated by generate_maze_cached
+MAZE_CACHE_DIR = ".cache"
+
+# Version of the maze generator, part of the names of the cached mazes,
+# it changes whenever generate_maze creates different mazes for a seed
+MAZE_GENERATOR_VERSION = 3
+
 
 def generate_random_graph(
     n: int,
@@ -40,50 +51,142 @@ def generate_random_graph(
     """
     graph = nx.gnp_random_graph(n=n, p=edge_p, seed=seed)
 
-    for _, _, w in graph.edges(data=True):
-        w["weight"] = np.random.randint(min_weight, max_weight + 1)
+    # the weights of all edges are drawn at once
+    rng = np.random.default_rng(seed)
+    weights = rng.integers(
+        min_weight, max_weight + 1, size=graph.number_of_edges()
+    )
+    for (_, _, w), weight in zip(graph.edges(data=True), weights.tolist()):
+        w["weight"] = weight
 
     return graph
 
 
-def _generate_maze_kruskal(rows: int, cols: int) -> nx.Graph:
+class MazeResult(NamedTuple):
+    """
+    Maze stored as an array of edges between the cells numbered
+    row * cols + col.
+
+    Attributes:
+        rows: Number of rows in the maze.
+        cols: Number of columns in the maze.
+        edges: Array of type int32 of shape (E, 2) with the cells
+            connected by each edge.
+    """
+
+    rows: int
+    cols: int
+    edges: np.ndarray
+
+    @property
+    def number_of_nodes(self) -> int:
+        return self.rows * self.cols
+
+    def to_networkx(self) -> nx.Graph:
+        """
+        Build the NetworkX graph of the maze with (row, col) nodes.
+
+        Returns:
+            The maze represented as a NetworkX graph.
+        """
+        graph = nx.Graph()
+        graph.add_nodes_from(np.ndindex(self.rows, self.cols))
+        first_rows, first_cols = np.divmod(self.edges[:, 0], self.cols)
+        second_rows, second_cols = np.divmod(self.edges[:, 1], self.cols)
+        graph.add_edges_from(
+            zip(
+                zip(first_rows.tolist(), first_cols.tolist()),
+                zip(second_rows.tolist(), second_cols.tolist()),
+            )
+        )
+        return graph
+
+
+def _generate_maze_kruskal(
+    rows: int,
+    cols: int,
+    seed: Union[int, np.random.Generator, None] = None,
+) -> MazeResult:
     """
     Generates a random maze using Kruskal's algorithm.
 
     Args:
         rows: Number of rows in the maze
         cols: Number of columns in the maze
+        seed: Seed for random number generation (for reproducibility)
+            or the generator itself.
 
     Returns:
-            Maze represented as a connected NetworkX graph.
+            Maze represented as a spanning tree of the grid of cells,
+            see MazeResult.to_networkx for the NetworkX graph.
+    """
+    rng = np.random.default_rng(seed)
+    cells = np.arange(rows * cols).reshape(rows, cols)
+
+    # edges between horizontally and vertically adjacent cells
+    first = np.concatenate((cells[:, :-1].ravel(), cells[:-1, :].ravel()))
+    second = np.concatenate((cells[:, 1:].ravel(), cells[1:, :].ravel()))
+
+    # Kruskal's algorithm visits the edges in ascending order of their
+    # weights, for independent random weights that order is a uniformly
+    # random permutation, so it is drawn directly
+    order = rng.permutation(len(first))
+    first, second = first[order], second[order]
+    in_tree = _spanning_tree_edges(first, second, rows * cols)
+    edges = np.stack((first[in_tree], second[in_tree]), axis=1)
+
+    return MazeResult(rows, cols, edges.astype(np.int32))
+
+
+@njit(cache=True)
+def _spanning_tree_edges(
+    first: np.ndarray,
+    second: np.ndarray,
+    n_nodes: int,
+) -> np.ndarray:
     """
-    graph = nx.grid_2d_graph(rows, cols)
+    Select the edges of a spanning forest with Kruskal's algorithm,
+    the edges are visited in the given order.
 
-    # Randomize the weight of the edges to prepare
-    # for Kruskal's algorithm
-    edges = list(graph.edges())
-    np.random.shuffle(edges)
-    # Floating-point weights between [0, 1) are used to randomize
-    # the creation of the MST
-    edges_with_weights = [
-        (u, v, {"weight": np.random.random_sample()}) for u, v in edges
-    ]
+    Args:
+        first: First endpoints of the edges.
+        second: Second endpoints of the edges.
+        n_nodes: Number of nodes, they are integers from 0 to n_nodes - 1.
 
-    mod_graph = nx.Graph()
-    mod_graph.add_edges_from(edges_with_weights)
+    Returns:
+        Boolean mask of the edges belonging to the spanning forest.
+    """
+    # union-find with union by size and path halving
+    parent = np.arange(n_nodes)
+    size = np.ones(n_nodes, dtype=np.int64)
+    in_tree = np.zeros(len(first), dtype=np.bool_)
 
-    mst = nx.minimum_spanning_tree(mod_graph, algorithm="kruskal")
+    for i in range(len(first)):
+        u, v = first[i], second[i]
+        while parent[u] != u:
+            parent[u] = parent[parent[u]]
+            u = parent[u]
+        while parent[v] != v:
+            parent[v] = parent[parent[v]]
+            v = parent[v]
+        if u == v:
+            # the edge would close a cycle
+            continue
 
-    for _, _, d in mst.edges(data=True):
-        del d["weight"]
+        if size[u] < size[v]:
+            u, v = v, u
+        parent[v] = u
+        size[u] += size[v]
+        in_tree[i] = True
 
-    return mst
+    return in_tree
 
 
 def generate_maze(
     rows: int,
     cols: int,
     extra_edges: Optional[int] = None,
+    seed: Optional[int] = None,
 ):
     """
     Generate a random maze. At least one cycle in the maze is guaranteed.
@@ -97,45 +200,141 @@ def generate_maze(
         rows: Number of rows in the maze
         cols: Number of columns in the maze
         extra_edges: Number of extra edges added to try to create a cycle
+        seed: Seed for random number generation (for reproducibility).
 
     Returns:
         Maze represented as a connected NetworkX graph with a cycle.
     """
+    rng = np.random.default_rng(seed)
+
     if extra_edges is None:
         # Approximate number of edges that can be added multiplied
         # by the fraction that we want to add
         edge_num = rows * cols * 4
         extra_edges = int(NEW_EDGES_FRAC * edge_num)
 
-    graph = _generate_maze_kruskal(rows, cols)
-
-    def get_valid_neighbors(node: tuple[int, int], rows: int, cols: int):
-        """
-        Get all valid nodes with which the given node can be connected.
-        """
-        row, col = node
-        neighbors = [
-            (row + 1, col),
-            (row - 1, col),
-            (row, col + 1),
-            (row, col - 1),
-        ]
-        return [
-            (r, c) for r, c in neighbors if 0 <= r < rows and 0 <= c < cols
-        ]
+    # the generator continues with the extra edges after the spanning tree
+    graph = _generate_maze_kruskal(rows, cols, rng).to_networkx()
 
     # Add extra edges to create cycles
     # Iterate for a number of extra edges. If the extra edges do not yield
     # a cycle then iterate until we get a first cycle.
+    # The maze starts as a spanning tree, so any added edge closes a cycle
     added_edges = 0
-    while added_edges < extra_edges or nx.is_tree(graph):
-        u = (random.randint(0, rows - 1), random.randint(0, cols - 1))
-        valid_neighbors = get_valid_neighbors(u, rows, cols)
+    has_cycle = False
+    # edges as (smaller, larger) node pairs, so the membership test
+    # does not go through the adjacency dictionaries of the graph
+    edge_set = {(min(u, v), max(u, v)) for u, v in graph.edges()}
+    # candidate edges are drawn in batches as a cell and a direction
+    # towards its neighbor, the ones leaving the maze are skipped
+    batch_size = max(4 * extra_edges, 16)
+    while added_edges < extra_edges or not has_cycle:
+        candidates = zip(
+            rng.integers(0, rows, size=batch_size).tolist(),
+            rng.integers(0, cols, size=batch_size).tolist(),
+            rng.integers(0, len(NEIGHBOR_OFFSETS), size=batch_size).tolist(),
+        )
+        for row, col, direction in candidates:
+            if added_edges >= extra_edges and has_cycle:
+                break
 
-        if valid_neighbors:
-            v = random.choice(valid_neighbors)
-            if not graph.has_edge(u, v):
+            d_row, d_col = NEIGHBOR_OFFSETS[direction]
+            other_row, other_col = row + d_row, col + d_col
+            if not (0 <= other_row < rows and 0 <= other_col < cols):
+                continue
+
+            u, v = (row, col), (other_row, other_col)
+            key = (min(u, v), max(u, v))
+            if key not in edge_set:
+                edge_set.add(key)
                 graph.add_edge(u, v)
                 added_edges += 1
+                has_cycle = True
 
     return graph
+
+
+def generate_maze_cached(
+    rows: int,
+    cols: int,
+    seed: int,
+    extra_edges: Optional[int] = None,
+    cache_dir: str = MAZE_CACHE_DIR,
+) -> nx.Graph:
+    """
+    Generate a random maze or load it from the disk cache if a maze with
+    the same parameters was generated before. Mazes are deterministic
+    for a given seed, so the cached maze is the one generate_maze would
+    create.
+
+    Args:
+        rows: Number of rows in the maze
+        cols: Number of columns in the maze
+        seed: Seed for random number generation.
+        extra_edges: Number of extra edges added to try to create a cycle
+        cache_dir: Directory holding the cached mazes.
+
+    Returns:
+        Maze represented as a connected NetworkX graph with a cycle.
+    """
+    parameters = f"{rows}x{cols}_{extra_edges}_{seed}"
+    file_path = os.path.join(
+        cache_dir, f"maze_v{MAZE_GENERATOR_VERSION}_{parameters}.npz"
+    )
+
+    if os.path.isfile(file_path):
+        maze, _, _ = load_maze(file_path)
+        return maze
+
+    maze = generate_maze(rows, cols, extra_edges=extra_edges, seed=seed)
+    save_maze(file_path, maze, rows, cols)
+
+    return maze
+
+
+def save_maze(file_path: str, maze: nx.Graph, rows: int, cols: int):
+    """
+    Save a maze to a compressed .npz file.
+
+    Args:
+        file_path: Path to the .npz file.
+        maze: Maze represented as a NetworkX graph with (row, col) nodes.
+        rows: Number of rows in the maze
+        cols: Number of columns in the maze
+    """
+    directory = os.path.dirname(file_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    # edges are stored as an int32 array of shape (E, 2, 2)
+    # holding the (row, col) coordinates of their endpoints
+    #
+    # the maze is written to a temporary file first and moved into place,
+    # so processes sharing the cache never load a partially written file
+    temporary_path = f"{file_path}.{os.getpid()}.tmp"
+    with open(temporary_path, mode="wb") as file:
+        np.savez_compressed(
+            file,
+            edges=np.array(maze.edges(), dtype=np.int32).reshape(-1, 2, 2),
+            rows=rows,
+            cols=cols,
+        )
+    os.replace(temporary_path, file_path)
+
+
+def load_maze(file_path: str) -> Tuple[nx.Graph, int, int]:
+    """
+    Load a maze saved with save_maze.
+
+    Args:
+        file_path: Path to the .npz file.
+
+    Returns:
+        The maze represented as a NetworkX graph with (row, col) nodes,
+        the number of its rows and the number of its columns.
+    """
+    with np.load(file_path) as data:
+        edges = data["edges"].tolist()
+        rows, cols = int(data["rows"]), int(data["cols"])
+
+    return nx.Graph((tuple(u), tuple(v)) for u, v in edges), rows, cols
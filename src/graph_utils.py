@@ -9,7 +9,118 @@ input to the ACO algorithm.
 """
 
 import networkx as nx  # type: ignore
-from typing import Tuple
+from numba import njit  # type: ignore
+import numpy as np
+from scipy.sparse import csr_matrix  # type: ignore
+from typing import NamedTuple, Optional, Tuple
+
+
+class CSRGraph(NamedTuple):
+    """
+    Compressed sparse row (CSR) representation of an undirected graph
+    whose nodes are integers from 0 to N - 1.
+
+    The neighbors of node n are stored in
+    indices[indptr[n]:indptr[n + 1]] sorted in ascending order and
+    edge_ids at the same positions hold the ids of the edges leading
+    to them. Every undirected edge is stored once for each of its
+    endpoints and both entries share the same id.
+
+    Attributes:
+        indptr: Array of length N + 1 with the offsets of the neighbor
+            lists of each node.
+        indices: Array of length 2E with the concatenated neighbor lists.
+        edge_ids: Array of length 2E with the ids of the edges.
+        degree: Array of length N with the degree of each node.
+        edges: Array of shape (E, 2) where the i-th row contains the
+            endpoints of the edge with id i.
+        weights: Array of length E with the weight of each edge.
+    """
+
+    indptr: np.ndarray
+    indices: np.ndarray
+    edge_ids: np.ndarray
+    degree: np.ndarray
+    edges: np.ndarray
+    weights: np.ndarray
+
+    @property
+    def number_of_nodes(self) -> int:
+        return len(self.degree)
+
+    @property
+    def number_of_edges(self) -> int:
+        return len(self.edges)
+
+    def edge_id(self, u: int, v: int) -> int:
+        """
+        Retrieve the id of the edge between two nodes.
+
+        Parameters:
+            u: First endpoint of the edge.
+            v: Second endpoint of the edge.
+
+        Returns:
+            The id of the edge.
+
+        Raises:
+            KeyError: If the nodes are not adjacent.
+        """
+        return int(self.edge_ids_between(np.array([u]), np.array([v]))[0])
+
+    def edge_ids_between(self, u: np.ndarray, v: np.ndarray) -> np.ndarray:
+        """
+        Retrieve the ids of the edges between pairs of nodes at once,
+        e.g. the edges of a path are given by path[:-1] and path[1:].
+
+        Parameters:
+            u: Array with the first endpoints of the edges.
+            v: Array with the second endpoints of the edges.
+
+        Returns:
+            Array with the ids of the edges.
+
+        Raises:
+            KeyError: If the nodes of a pair are not adjacent.
+        """
+        u = np.asarray(u, dtype=np.int64)
+        v = np.asarray(v, dtype=np.int64)
+        # only the neighbor lists of the first endpoints are searched,
+        # so the cost depends on the number of pairs and not on the graph
+        positions = _edge_positions(self.indptr, self.indices, u, v)
+        missing = np.flatnonzero(positions < 0)
+        if len(missing):
+            pair = int(u[missing[0]]), int(v[missing[0]])
+            raise KeyError(f"No edge between the nodes {pair}")
+        return self.edge_ids[positions]
+
+    def neighbors(self, node: int) -> np.ndarray:
+        """
+        Retrieve the neighbors of a node.
+
+        Parameters:
+            node: The node.
+
+        Returns:
+            Sorted array of the neighbors, it is a view of the indices array.
+        """
+        start, stop = self.indptr[node], self.indptr[node + 1]
+        return self.indices[start:stop]
+
+    def to_scipy(self) -> csr_matrix:
+        """
+        Converts the graph to a SciPy sparse adjacency matrix holding
+        the edge weights, e.g. for the scipy.sparse.csgraph routines.
+
+        Returns:
+            Symmetric N x N sparse matrix sharing the index arrays
+            with the graph.
+        """
+        n_nodes = self.number_of_nodes
+        return csr_matrix(
+            (self.weights[self.edge_ids], self.indices, self.indptr),
+            shape=(n_nodes, n_nodes),
+        )
 
 
 def node_tuple_to_int(node: Tuple[int, int], grid_width: int) -> int:
@@ -43,48 +154,133 @@ def node_int_to_tuple(node: int, grid_width: int) -> Tuple[int, int]:
     return row, col
 
 
-def convert_grid_to_graph(grid_graph: nx.Graph) -> nx.Graph:
+def convert_grid_to_graph(
+    grid_graph: nx.Graph,
+    grid_width: Optional[int] = None,
+) -> nx.Graph:
     """
     Converts a grid with nodes represented as tuples (row, col)
     to a NetworkX graph where nodes are represented by integers.
 
     Parameters:
         grid_graph: A NetworkX graph where nodes are tuples (row, col).
+        grid_width: The width of the grid, computed from the nodes
+            if not given.
 
     Returns:
         A NetworkX graph with nodes represented as integers.
     """
-    undirected_graph = nx.Graph()
-    grid_width = max(node[1] for node in grid_graph.nodes()) + 1
+    nodes = np.array(grid_graph.nodes(), dtype=np.int64).reshape(-1, 2)
+    ends = np.array(grid_graph.edges(), dtype=np.int64).reshape(-1, 2, 2)
+    if grid_width is None:
+        grid_width = int(nodes[:, 1].max()) + 1
 
-    for node in grid_graph.nodes():
-        int_node = node_tuple_to_int(node, grid_width)
-        undirected_graph.add_node(int_node)
+    # nodes and edges are inserted in ascending order of the integer ids,
+    # so the nodes of the graph form a contiguous range and the edge ids
+    # assigned by convert_graph_to_csr follow the layout of the grid
+    int_nodes = np.sort(nodes[:, 0] * grid_width + nodes[:, 1])
+    int_ends = ends[:, :, 0] * grid_width + ends[:, :, 1]
+    first, second = int_ends.min(axis=1), int_ends.max(axis=1)
+    order = np.lexsort((second, first))
+    int_edges = np.stack((first[order], second[order]), axis=1)
 
-    for u, v in grid_graph.edges():
-        int_u = node_tuple_to_int(u, grid_width)
-        int_v = node_tuple_to_int(v, grid_width)
-        undirected_graph.add_edge(int_u, int_v)
+    undirected_graph = nx.Graph()
+    undirected_graph.add_nodes_from(int_nodes.tolist())
+    undirected_graph.add_edges_from(map(tuple, int_edges.tolist()))
 
     return undirected_graph
 
 
-def ensure_undirected_with_symmetry(graph: nx.Graph) -> nx.Graph:
+def convert_graph_to_csr(graph: nx.Graph) -> CSRGraph:
     """
-    Converts a graph to an undirected graph and ensures that both directions
-    of each edge are explicitly included.
+    Converts an undirected NetworkX graph with nodes represented by
+    integers to the CSR representation used by the ACO algorithm.
 
     Parameters:
-        graph: The graph to be converted.
+        graph: A NetworkX graph where nodes are integers from 0 to N - 1.
+            Edges without the "weight" attribute get the weight 1.
 
     Returns:
-        The undirected graph with symmetric edges.
+        The CSR representation of the graph. Edge ids follow the order
+        of graph.edges().
     """
-    undirected_graph = nx.Graph()
-    undirected_graph.add_nodes_from(graph.nodes())
+    n_nodes = max(graph.nodes(), default=-1) + 1
+    edges = np.array(graph.edges(), dtype=np.int32).reshape(-1, 2)
+    weights = np.fromiter(
+        (w for _, _, w in graph.edges(data="weight", default=1)),
+        dtype=np.float64,
+        count=len(edges),
+    )
+    return convert_edges_to_csr(edges, n_nodes, weights)
 
-    for u, v in graph.edges():
-        undirected_graph.add_edge(u, v)
-        undirected_graph.add_edge(v, u)
 
-    return undirected_graph
+def convert_edges_to_csr(
+    edges: np.ndarray,
+    n_nodes: int,
+    weights: Optional[np.ndarray] = None,
+) -> CSRGraph:
+    """
+    Converts an array of undirected edges to the CSR representation
+    used by the ACO algorithm.
+
+    Parameters:
+        edges: Array of shape (E, 2) with the endpoints of each edge,
+            the endpoints are integers from 0 to N - 1.
+        n_nodes: The number of nodes N.
+        weights: Array of length E with the weight of each edge,
+            all edges get the weight 1 if not given.
+
+    Returns:
+        The CSR representation of the graph. Edge ids follow the order
+        of the edges in the array.
+    """
+    edges = np.asarray(edges, dtype=np.int32).reshape(-1, 2)
+    n_edges = len(edges)
+    if weights is None:
+        weights = np.ones(n_edges)
+
+    # every undirected edge appears in the neighbor lists of both endpoints
+    sources = np.concatenate((edges[:, 0], edges[:, 1]))
+    targets = np.concatenate((edges[:, 1], edges[:, 0]))
+    ids = np.tile(np.arange(n_edges, dtype=np.int32), 2)
+
+    # group the entries by source node and sort each neighbor list
+    order = np.lexsort((targets, sources))
+    degree = np.bincount(sources, minlength=n_nodes).astype(np.int32)
+    indptr = np.zeros(n_nodes + 1, dtype=np.int32)
+    np.cumsum(degree, out=indptr[1:])
+
+    return CSRGraph(
+        indptr=indptr,
+        indices=targets[order],
+        edge_ids=ids[order],
+        degree=degree,
+        edges=edges,
+        weights=weights,
+    )
+
+
+@njit(cache=True)
+def _edge_positions(
+    indptr: np.ndarray,
+    indices: np.ndarray,
+    u: np.ndarray,
+    v: np.ndarray,
+) -> np.ndarray:
+    """
+    Find the positions of the pairs of nodes in the neighbor lists with
+    a binary search in the sorted neighbor list of each first endpoint.
+
+    Returns:
+        Array with the positions in the indices array, -1 for the pairs
+        of nodes that are not adjacent.
+    """
+    positions = np.full(len(u), -1, dtype=np.int64)
+    for i in range(len(u)):
+        if u[i] < 0 or u[i] >= len(indptr) - 1:
+            continue
+        start, stop = indptr[u[i]], indptr[u[i] + 1]
+        k = start + np.searchsorted(indices[start:stop], v[i])
+        if k < stop and indices[k] == v[i]:
+            positions[i] = k
+    return positions
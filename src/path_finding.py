@@ -6,18 +6,19 @@ the shortest path between to given nodes in a graph.
 # mypy: no_implicit_optional = False
 
 import networkx as nx  # type: ignore
-from typing import List, Tuple
-import os
+import numpy as np
+from typing import List, Tuple, Union
 
 from .aco_strategies import MoveSelectionStrategy, PheromoneUpdateStrategy
 from .aco_strategies import PheromoneBasedMoveSelection, BasicPheromoneUpdate
-from .state_saver import save_state
+from .graph_utils import CSRGraph, convert_graph_to_csr
+from .state_saver import StateWriter
 
 
 class AntColonyOptimization:
     def __init__(
         self,
-        graph: nx.Graph,
+        graph: Union[nx.Graph, CSRGraph],
         n_ants: int,
         n_best: int,
         n_iterations: int,
@@ -33,7 +34,9 @@ class AntColonyOptimization:
 
         Parameters:
             graph: The graph on which the ACO algorithm will run.
-                The graph is converted to and undirected graph.
+                NetworkX graphs are converted to and undirected graph
+                stored in the CSR format, so its nodes have to be integers
+                from 0 to N - 1.
             n_ants: The number of ants used in each iteration.
             n_best: The number of best ants whose paths will be used
                 to update the pheromone levels.
@@ -49,7 +52,13 @@ class AntColonyOptimization:
             pheromone_update_strategy: The strategy used for updating the
                 pheromone levels.
         """
-        self.graph = graph.to_undirected()
+        if isinstance(graph, CSRGraph):
+            self.graph = graph
+        else:
+            # undirected graphs are converted without copying them first
+            if graph.is_directed():
+                graph = graph.to_undirected()
+            self.graph = convert_graph_to_csr(graph)
         self.n_ants = n_ants
         self.n_best = n_best
         self.n_iterations = n_iterations
@@ -57,8 +66,10 @@ class AntColonyOptimization:
         self.decay = decay
         self.alpha = alpha
         self.beta = beta
-        self.pheromone = {edge: 1 for edge in self.graph.edges()}
-        self.all_nodes = list(graph.nodes())
+        # pheromone levels are kept in a contiguous array indexed by the
+        # edge ids of the CSR representation of the graph
+        self.pheromone = np.ones(self.graph.number_of_edges)
+        self.all_nodes = list(range(self.graph.number_of_nodes))
         self.move_selection_strategy = move_selection_strategy
         self.pheromone_update_strategy = pheromone_update_strategy
 
@@ -73,7 +84,7 @@ class AntColonyOptimization:
         self,
         start: int,
         end: int,
-    ) -> Tuple[List[int], int]:
+    ) -> Tuple[np.ndarray, int]:
         """
         Run the ACO algorithm to find the shortest path from the start
         node to the end node.
@@ -91,33 +102,34 @@ class AntColonyOptimization:
         # shortest path found across all iterations
         all_time_shortest_path = ((0, 0), int(1e100))
 
-        if not os.path.isdir("data"):
-            os.mkdir("data")
-
-        # remove existing file contents
-        open(self.filename, "w").close()
-
-        for iteration in range(self.n_iterations):
-            # construct a path for all ants from start to end
-            all_paths = self._construct_colony_paths(start, end)
-            # update the pheromone on the edges based on the paths
-            # found by the ants
-            self.pheromone = self.pheromone_update_strategy.update_pheromone(
-                self.pheromone, all_paths, self.decay, self.n_best
-            )
-            # find the shortest path in the current iteration
-            shortest_path = min(all_paths, key=lambda x: x[1])
-
-            if shortest_path[1] < all_time_shortest_path[1]:
-                all_time_shortest_path = shortest_path
-
-            save_state(
-                iteration=iteration,
-                pheromone=self.pheromone,
-                all_paths=all_paths,
-                shortest_path=all_time_shortest_path,
-                filepath=self.filename,
-            )
+        # existing file contents are removed
+        with StateWriter(self.filename) as writer:
+            for iteration in range(self.n_iterations):
+                # construct a path for all ants from start to end
+                all_paths = self._construct_colony_paths(start, end)
+                # update the pheromone on the edges based on the paths
+                # found by the ants
+                update_strategy = self.pheromone_update_strategy
+                self.pheromone = update_strategy.update_pheromone(
+                    self.graph,
+                    self.pheromone,
+                    all_paths,
+                    self.decay,
+                    self.n_best,
+                )
+                # find the shortest path in the current iteration
+                shortest_path = min(all_paths, key=lambda x: x[1])
+
+                if shortest_path[1] < all_time_shortest_path[1]:
+                    all_time_shortest_path = shortest_path
+
+                writer.save_state(
+                    iteration=iteration,
+                    edges=self.graph.edges,
+                    pheromone=self.pheromone,
+                    all_paths=all_paths,
+                    shortest_path=all_time_shortest_path,
+                )
 
         return all_time_shortest_path
 
@@ -125,7 +137,7 @@ class AntColonyOptimization:
         self,
         start: int,
         end: int,
-    ) -> List[Tuple[List[int], int]]:
+    ) -> List[Tuple[np.ndarray, int]]:
         """
         Constructs paths for all ants in the colony from the
         start node to the end node.
@@ -135,73 +147,26 @@ class AntColonyOptimization:
             end: The end node.
 
         Returns:
-            A list of tuples where each tuple contains a path and its length.
+            A list of tuples where each tuple contains a path stored
+            as an int32 array and its length.
         """
-        all_paths = []
-        for _ in range(self.n_ants):
-            path = self._construct_path(start, end)
-            all_paths.append((path, AntColonyOptimization.path_length(path)))
-
-        return all_paths
-
-    def _construct_path(
-        self,
-        start: int,
-        end: int,
-    ) -> List[int]:
-        """
-        Constructs a single path for an ant from the start node
-        to the end node.
-
-        Parameters:
-            start: The start node.
-            end: The end node.
-
-        Returns:
-            The path constructed by the ant.
-        """
-        return list(reversed(
-            self._construct_path_dfs(start, end, set())
-        ))
-
-    def _construct_path_dfs(self, node: int, end: int, explored: set[int]) -> List[int]:
-        """
-                Constructs a path using dfs algorithm.
-
-                Parameters:
-                    start: The start node.
-                    end: The end node.
-                    explored: Set of already explored nodes
-
-                Returns:
-                    The path constructed by the ant.
-                """
-        explored.add(node)
-        if node == end:
-            return [node]
-
-        def _next_move():
-            return self.move_selection_strategy.select_move(
-                self.graph,
-                self.pheromone,
-                explored,
-                node,
-                self.alpha,
-                self.beta,
-            )
-
-        v = _next_move()
-        while v:
-            result = self._construct_path_dfs(v, end, explored)
-            if result:
-                result.append(node)
-                return result
-            v = _next_move()
-
-        return []
+        # all ants walk on the same pheromone levels so their paths
+        # can be constructed independently of each other
+        paths = self.move_selection_strategy.construct_colony_paths(
+            self.graph,
+            self.pheromone,
+            self.n_ants,
+            start,
+            end,
+            self.alpha,
+            self.beta,
+        )
+        return [
+            (path, AntColonyOptimization.path_length(path)) for path in paths
+        ]
 
     @staticmethod
-    def path_length(path: List[int]) -> int:
+    def path_length(path: np.ndarray) -> int:
         """
         Calculates the length of a given path.
 
@@ -4,11 +4,216 @@ state from JSON files created by functions from
 state_saver module.
 """
 
-import json
-from typing import List, Dict, Any, Callable
+import base64
+from bisect import bisect_right
+from functools import lru_cache
+import numpy as np
+import orjson
+import os
+from typing import List, Dict, Any, Callable, Iterator, NamedTuple, Optional
+from typing import Tuple
 
 DEFAULT_FILE_PATH = "data/aco_state.jsonl"
 
+# Number of indexed files kept in memory
+INDEX_CACHE_SIZE = 8
+
+# Start of the lines written by state_saver, the iteration number
+# is read from it without parsing the whole line
+_ITERATION_PREFIX = b'{"iteration":'
+
+# Start of the header line storing the endpoints of the edges
+_HEADER_PREFIX = b'{"pheromone_edges":'
+
+# Keys of the pheromone levels and their changes as saved in the file
+RAW_PHEROMONE_KEYS = (
+    "pheromone_edges",
+    "pheromone_levels",
+    "pheromone_scale",
+    "pheromone_changed_ids",
+    "pheromone_changed_levels",
+)
+
+
+def _decode_array(value: Any) -> np.ndarray:
+    """
+    Restore an array saved by state_saver, either as raw bytes in base64
+    or as nested lists of numbers.
+    """
+    if isinstance(value, dict):
+        data = base64.b64decode(value["data"])
+        return np.frombuffer(data, dtype=value["dtype"]).reshape(
+            value["shape"]
+        )
+    return np.asarray(value)
+
+
+class _PheromoneReplay:
+    """
+    Restores the pheromone levels of the states saved as changes
+    with respect to the previous state.
+    """
+
+    def __init__(self):
+        self.edges: Optional[np.ndarray] = None
+        self.values = np.empty(0)
+        # "u-v" keys of the restored levels, built when first needed
+        self._keys: Optional[List[str]] = None
+
+    def apply(self, state: Dict[str, Any]):
+        """
+        Update the pheromone levels with the ones stored in a state
+        or the endpoints of the edges stored in the header line.
+        """
+        if "pheromone_edges" in state:
+            self.edges = _decode_array(state["pheromone_edges"])
+            self._keys = None
+
+        if "pheromone_levels" in state:
+            if self.edges is None:
+                raise ValueError("The saved states lack the edges")
+            self.values = _decode_array(state["pheromone_levels"])
+            return
+
+        if "pheromone" in state:
+            # levels keyed by "u-v" strings saved by older versions
+            pheromone = state["pheromone"]
+            self._keys = list(pheromone)
+            self.edges = np.array(
+                [list(map(int, k.split("-"))) for k in self._keys]
+            ).reshape(-1, 2)
+            self.values = np.fromiter(
+                pheromone.values(), dtype=np.float64, count=len(pheromone)
+            )
+            return
+
+        if "pheromone_scale" not in state:
+            # the header line stores only the edges
+            return
+
+        if self.edges is None:
+            raise ValueError("The first saved state lacks pheromone levels")
+
+        # the levels are scaled in the precision they were saved in,
+        # the same as state_saver does
+        self.values = self.values * state["pheromone_scale"]
+        self.values[state["pheromone_changed_ids"]] = state[
+            "pheromone_changed_levels"
+        ]
+
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Retrieve the endpoints of the edges as an (E, 2) array and
+        the pheromone levels restored so far indexed by the edge id.
+        """
+        return self.edges, self.values
+
+    def restore(
+        self,
+        state: Dict[str, Any],
+        pheromone_arrays: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Replace the pheromone levels or changes of a state with the levels
+        of all edges, either as the tuple returned by arrays or keyed
+        by "u-v" strings.
+        """
+        for key in RAW_PHEROMONE_KEYS:
+            state.pop(key, None)
+        if pheromone_arrays:
+            state["pheromone"] = self.arrays()
+            return state
+
+        if self._keys is None:
+            self._keys = [f"{u}-{v}" for u, v in self.edges.tolist()]
+        state["pheromone"] = dict(zip(self._keys, self.values.tolist()))
+        return state
+
+
+def _iter_raw_states(file_path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over the states as saved in the JSON Lines file.
+    """
+    with open(file_path, mode="rb") as file:
+        for line in file:
+            yield orjson.loads(line)
+
+
+class _StateIndex(NamedTuple):
+    """
+    Positions of the states within the JSON Lines file.
+    """
+
+    # byte offset of the start of each line
+    offsets: List[int]
+    # line number of the first state of each iteration
+    lines: Dict[int, int]
+    # sorted line numbers of the states storing all pheromone levels
+    keyframes: List[int]
+    # sorted line numbers of the header lines storing the edges
+    headers: List[int]
+
+
+def _line_iteration(line: bytes) -> int:
+    if line.startswith(_ITERATION_PREFIX):
+        end = line.find(b",", len(_ITERATION_PREFIX))
+        if end != -1:
+            return int(line[len(_ITERATION_PREFIX) : end])
+    return orjson.loads(line)["iteration"]
+
+
+def _is_keyframe(line: bytes) -> bool:
+    return b'"pheromone_levels":' in line or b'"pheromone":' in line
+
+
+@lru_cache(maxsize=INDEX_CACHE_SIZE)
+def _index_states(file_path: str, modified: int, size: int) -> _StateIndex:
+    """
+    Scan the JSON Lines file for the positions of the states. Results are
+    memoized, the modification time and the size of the file make sure
+    the states saved by a new run are indexed again.
+    """
+    index = _StateIndex([], {}, [], [])
+    offset = 0
+    with open(file_path, mode="rb") as file:
+        for number, line in enumerate(file):
+            index.offsets.append(offset)
+            offset += len(line)
+            if line.startswith(_HEADER_PREFIX):
+                index.headers.append(number)
+                continue
+            index.lines.setdefault(_line_iteration(line), number)
+            if _is_keyframe(line):
+                index.keyframes.append(number)
+    return index
+
+
+def _iter_states(file_path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over the states from the JSON Lines file with all pheromone
+    levels restored.
+    """
+    replay = _PheromoneReplay()
+    for state in _iter_raw_states(file_path):
+        replay.apply(state)
+        if "iteration" in state:
+            yield replay.restore(state)
+
+
+def iter_all_states(file_path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over the states after all iterations from the JSON Lines
+    file, only one state is kept in memory at a time.
+
+    Parameters:
+        file_path: The path to the JSON Lines file.
+
+    Returns:
+        An iterator over dictionaries, each representing the
+        state of one iteration.
+    """
+    return _iter_states(file_path)
+
 
 def load_all_states(file_path: str) -> List[Dict[str, Any]]:
     """
@@ -22,35 +227,75 @@ def load_all_states(file_path: str) -> List[Dict[str, Any]]:
         A list of dictionaries, each representing the
         state of one iteration.
     """
-    states = []
-    with open(file_path, mode="r") as file:
-        for line in file:
-            states.append(json.loads(line))
-
-    return states
+    return list(_iter_states(file_path))
 
 
 def load_state_by_iteration(
     file_path: str,
     iteration: int,
+    pheromone_arrays: bool = False,
 ) -> Dict[str, Any]:
     """
     Load a specific iteration's state from the JSON Lines file.
 
+    The positions of the states are indexed when the file is read for
+    the first time, so the following calls read only the state and the
+    changes since the preceding state storing all pheromone levels.
+
     Parameters:
         file_path: The path to the JSON Lines file.
         iteration: The iteration number to retrieve.
+        pheromone_arrays: Whether the pheromone levels are returned as
+            a tuple of the (E, 2) array of the endpoints of the edges
+            and the array of their levels instead of a dictionary keyed
+            by "u-v" strings. The arrays must not be modified.
 
     Returns:
         A dictionary representing the state of the specified iteration.
     """
-    with open(file_path, mode="r") as file:
-        for line in file:
-            state = json.loads(line)
-            if state["iteration"] == iteration:
-                return state
+    stat = os.stat(file_path)
+    index = _index_states(os.fspath(file_path), stat.st_mtime_ns, stat.st_size)
+    if iteration not in index.lines:
+        raise ValueError(f"Iteration {iteration} not found in {file_path}")
+
+    # pheromone levels are restored only for the requested state,
+    # the preceding ones just replay their changes
+    line = index.lines[iteration]
+    keyframe = bisect_right(index.keyframes, line) - 1
+    first = index.keyframes[keyframe] if keyframe >= 0 else 0
+    header = bisect_right(index.headers, first) - 1
+
+    replay = _PheromoneReplay()
+    with open(file_path, mode="rb") as file:
+        if header >= 0:
+            file.seek(index.offsets[index.headers[header]])
+            replay.apply(orjson.loads(file.readline()))
+        file.seek(index.offsets[first])
+        for _ in range(first, line + 1):
+            state = orjson.loads(file.readline())
+            replay.apply(state)
 
-    raise ValueError(f"Iteration {iteration} not found in {file_path}")
+    return replay.restore(state, pheromone_arrays)
+
+
+def iter_filtered_states(
+    file_path: str,
+    condition: Callable[[Any], bool],
+) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over the states that meet a specific condition from the JSON
+    Lines file, only one state is kept in memory at a time.
+
+    Parameters:
+        file_path: The path to the JSON Lines file.
+        condition: A function that takes a state dictionary and returns True
+            if it meets the condition.
+
+    Returns:
+        An iterator over dictionaries, each representing a state that
+            meets the condition.
+    """
+    return (state for state in _iter_states(file_path) if condition(state))
 
 
 def filter_states(
@@ -69,12 +314,4 @@ def filter_states(
         A list of dictionaries, each representing a state that meets the
             condition.
     """
-    filtered_states = []
-
-    with open(file_path, mode="r") as file:
-        for line in file:
-            state = json.loads(line)
-            if condition(state):
-                filtered_states.append(state)
-
-    return filtered_states
+    return list(iter_filtered_states(file_path, condition))
@@ -3,53 +3,250 @@ This module contains functions for saving the state
 of the algorithm after each iteration into files.
 """
 
-import json
-from typing import List, Tuple, Dict
+import base64
+from concurrent.futures import Future, ThreadPoolExecutor
+import numpy as np
+import orjson
+from typing import Any, Dict, List, Optional, Tuple
 import os
 
+# Size of the buffer used for writing the states to a file
+WRITE_BUFFER_SIZE = 1 << 20
 
-def save_state(
-    iteration: int,
-    pheromone: Dict[Tuple[int, int], float],
-    all_paths: List[Tuple[List[int], int]],
-    shortest_path: Tuple[List[int], int],
-    filepath: str = "aco_state.json",
-):
+# Number of iterations between two states storing all pheromone levels,
+# the states in between store only the changes since the previous state
+KEYFRAME_INTERVAL = 10
+
+
+# Options of orjson.dumps, NumPy arrays are serialized without
+# converting them to lists first
+DUMPS_OPTIONS = orjson.OPT_SERIALIZE_NUMPY
+
+# Type the pheromone levels are saved as, single precision is plenty
+# for comparing and drawing them and halves the size of the keyframes
+LEVEL_DTYPE = np.float32
+
+
+def _encode_array(array: np.ndarray) -> Dict[str, Any]:
+    """
+    Store an array as its raw bytes in base64 together with the type
+    and the shape needed to restore it, so the numbers are neither
+    formatted as text nor rounded.
+    """
+    array = np.ascontiguousarray(array)
+    return {
+        "dtype": array.dtype.str,
+        "shape": array.shape,
+        "data": base64.b64encode(array.data).decode("ascii"),
+    }
+
+
+def _encode_edges(edges: np.ndarray) -> Dict[str, Dict[str, Any]]:
+    """
+    Store the endpoints of the edges the pheromone levels belong to.
     """
-    Saves the state of the algorithm after an iteration
-    as a JSON object.
+    return {"pheromone_edges": _encode_array(edges)}
+
+
+def _encode_levels(levels: np.ndarray) -> Dict[str, Dict[str, Any]]:
+    """
+    Store pheromone levels already converted to LEVEL_DTYPE.
+    """
+    return {"pheromone_levels": _encode_array(levels)}
+
+
+def _encode_pheromone_delta(
+    previous: np.ndarray,
+    pheromone: np.ndarray,
+) -> Optional[Tuple[Dict[str, Any], np.ndarray]]:
+    """
+    Encode pheromone levels as changes with respect to the levels saved
+    in the previous state.
+
+    Pheromone evaporation scales the levels of all edges by the same
+    factor while deposits touch only a few edges, so the levels are
+    encoded as the common scale and the exact new levels of the edges
+    that do not follow it. The scaled levels are rounded the same way
+    as the saved ones, so they stay within the precision of LEVEL_DTYPE.
 
     Parameters:
-        iteration: The number of the iteration.
-        pheromone: Pheromone levels for the edges.
-        all_paths: All paths found by the ants.
-        shortest_path: The shortest path found.
-        filepath: Path to the JSON file.
-    """
-    # Convert values to standard Python data types
-    pheromone_values = {
-        f"{k[0]}-{k[1]}": float(v) for k, v in pheromone.items()
+        previous: The levels restored from the previous state.
+        pheromone: The levels to encode.
+
+    Returns:
+        Dictionary with the scale, the ids of the changed edges and their
+        levels together with the levels the loader restores from it
+        or None if the delta would not be smaller than the levels
+        themselves.
+    """
+    if len(pheromone) == 0:
+        return None
+
+    levels = pheromone.astype(LEVEL_DTYPE)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratios = pheromone / previous
+    # most of the edges share the ratio, so the middle element
+    # of the partially sorted ratios is the common one
+    middle = len(ratios) // 2
+    scale = float(np.partition(ratios, middle)[middle])
+    if not np.isfinite(scale):
+        return None
+
+    # the loader scales the previous levels in the same precision, so
+    # the levels of the edges whose scaled levels are as close to the new
+    # ones as LEVEL_DTYPE allows need not be stored
+    restored = previous * scale
+    tolerance = np.finfo(LEVEL_DTYPE).eps * np.abs(pheromone)
+    changed = np.flatnonzero(~(np.abs(restored - pheromone) <= tolerance))
+    if len(changed) > middle:
+        return None
+    restored[changed] = levels[changed]
+
+    delta = {
+        "pheromone_scale": scale,
+        "pheromone_changed_ids": changed,
+        "pheromone_changed_levels": levels[changed],
     }
+    return delta, restored
+
 
+def _encode_state(
+    iteration: int,
+    all_paths: List[Tuple[np.ndarray, int]],
+    shortest_path: Tuple[np.ndarray, int],
+) -> Dict[str, Any]:
+    """
+    Convert the state of the algorithm to standard Python data types,
+    pheromone levels are added by the caller.
+    """
     all_paths_values = [
-        {"path": [int(node) for node in path], "length": int(length)}
+        {"path": np.asarray(path).tolist(), "length": int(length)}
         for path, length in all_paths
     ]
 
     shortest_path_values = {
-        "path": [int(node) for node in shortest_path[0]],
+        "path": np.asarray(shortest_path[0]).tolist(),
         "length": int(shortest_path[1]),
     }
 
-    state = {
+    return {
         "iteration": iteration,
-        "pheromone": pheromone_values,
         "all_paths": all_paths_values,
         "shortest_path": shortest_path_values,
     }
 
-    if not os.path.isdir("data"):
-        os.mkdir("data")
 
-    with open(filepath, mode="a") as file:
-        file.write(json.dumps(state) + "\n")
+def _ensure_parent_dir(filepath: str):
+    directory = os.path.dirname(filepath)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+
+class StateWriter:
+    """
+    Class for saving the states of the algorithm after each iteration
+    into a JSON Lines file.
+
+    The file is kept open with a large buffer and the writes are handed
+    over to a background thread, so the algorithm does not wait for I/O.
+    States are serialized before the write is scheduled, so the arrays
+    passed to save_state can be modified right after the call.
+
+    The endpoints of the edges do not change between the iterations,
+    so they are saved once in a header line before the first state.
+    Every KEYFRAME_INTERVAL-th state stores the pheromone levels of all
+    edges, the other ones store only changes since the previous state.
+    Functions from the state_loader module restore the full states.
+    """
+
+    def __init__(
+        self,
+        filepath: str,
+        buffering: int = WRITE_BUFFER_SIZE,
+        keyframe_interval: int = KEYFRAME_INTERVAL,
+    ):
+        """
+        Open the file for writing, existing contents are removed.
+
+        Parameters:
+            filepath: Path to the JSON Lines file.
+            buffering: Size of the write buffer in bytes.
+            keyframe_interval: Number of states between two states
+                storing all pheromone levels.
+        """
+        self.keyframe_interval = keyframe_interval
+        self._n_saved = 0
+        self._previous = np.empty(0, dtype=LEVEL_DTYPE)
+        _ensure_parent_dir(filepath)
+        self._file = open(filepath, mode="wb", buffering=buffering)
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        # the first error raised by a write, it is raised again by close
+        self._error: Optional[BaseException] = None
+
+    def save_state(
+        self,
+        iteration: int,
+        edges: np.ndarray,
+        pheromone: np.ndarray,
+        all_paths: List[Tuple[np.ndarray, int]],
+        shortest_path: Tuple[np.ndarray, int],
+    ):
+        """
+        Saves the state of the algorithm after an iteration
+        as a JSON object.
+
+        Parameters:
+            iteration: The number of the iteration.
+            edges: Array of shape (E, 2) with the endpoints of each edge,
+                the same in all calls.
+            pheromone: Pheromone levels for the edges indexed by edge id.
+            all_paths: All paths found by the ants.
+            shortest_path: The shortest path found.
+        """
+        state = _encode_state(iteration, all_paths, shortest_path)
+
+        data = b""
+        if self._n_saved == 0:
+            data = orjson.dumps(_encode_edges(edges), option=DUMPS_OPTIONS)
+            data += b"\n"
+
+        delta = None
+        if self._n_saved % self.keyframe_interval != 0:
+            delta = _encode_pheromone_delta(self._previous, pheromone)
+
+        if delta is None:
+            levels = pheromone.astype(LEVEL_DTYPE)
+            state.update(_encode_levels(levels))
+        else:
+            changes, levels = delta
+            state.update(changes)
+
+        # the deltas are computed from the levels the loader restores,
+        # so its rounding errors do not add up over the deltas
+        self._previous = levels
+        self._n_saved += 1
+
+        data += orjson.dumps(state, option=DUMPS_OPTIONS) + b"\n"
+        write = self._executor.submit(self._file.write, data)
+        write.add_done_callback(self._record_error)
+
+    def _record_error(self, write: Future):
+        if self._error is None and write.exception() is not None:
+            self._error = write.exception()
+
+    def close(self):
+        """
+        Wait for the scheduled writes and close the file.
+        """
+        # the executor runs the writes in order on a single thread
+        self._executor.shutdown(wait=True)
+        self._file.close()
+        # surface errors raised by the writes
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self) -> "StateWriter":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,65 @@
+"""
+Helpers checking the structure of the graphs generated in the tests.
+
+The checks run a compiled BFS over the CSR representation of the graph,
+so they stay fast for mazes with hundreds of thousands of cells.
+"""
+
+import networkx as nx  # type: ignore
+from numba import njit  # type: ignore
+import numpy as np
+
+from src.graph_utils import convert_edges_to_csr, convert_graph_to_csr
+
+
+def is_connected(graph: nx.Graph) -> bool:
+    """
+    Check if a graph with any hashable nodes is connected.
+    """
+    graph = nx.convert_node_labels_to_integers(graph)
+    csr = convert_graph_to_csr(graph)
+    n_nodes = graph.number_of_nodes()
+    return _bfs_count(csr.indptr, csr.indices, n_nodes) == n_nodes
+
+
+def is_tree(graph: nx.Graph) -> bool:
+    """
+    Check if a graph with any hashable nodes is a tree.
+    """
+    n_nodes = graph.number_of_nodes()
+    return graph.number_of_edges() == n_nodes - 1 and is_connected(graph)
+
+
+def edges_connected(edges: np.ndarray, n_nodes: int) -> bool:
+    """
+    Check if the graph given by an (E, 2) array of edges between
+    the nodes 0 to n_nodes - 1 is connected.
+    """
+    csr = convert_edges_to_csr(edges, n_nodes)
+    return _bfs_count(csr.indptr, csr.indices, n_nodes) == n_nodes
+
+
+@njit(cache=True)
+def _bfs_count(indptr: np.ndarray, indices: np.ndarray, n_nodes: int) -> int:
+    """
+    Count the nodes reachable from node 0.
+    """
+    if n_nodes == 0:
+        return 0
+
+    visited = np.zeros(n_nodes, dtype=np.uint8)
+    queue = np.empty(n_nodes, dtype=np.int64)
+    visited[0] = 1
+    queue[0] = 0
+    head, tail = 0, 1
+    while head < tail:
+        node = queue[head]
+        head += 1
+        for k in range(indptr[node], indptr[node + 1]):
+            neighbor = indices[k]
+            if not visited[neighbor]:
+                visited[neighbor] = 1
+                queue[tail] = neighbor
+                tail += 1
+
+    return tail
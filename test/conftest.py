@@ -0,0 +1,44 @@
+"""
+Fixtures shared by the tests.
+
+Generated graphs are deterministic for a given seed, so they are created
+once per test session and shared by the tests, which must not modify them.
+"""
+
+from functools import lru_cache
+import pytest
+
+from src.graph_generation import _generate_maze_kruskal, generate_maze
+from src.graph_generation import generate_random_graph
+
+
+@pytest.fixture(scope="session")
+def kruskal_factory():
+    """
+    Spanning tree mazes keyed by (rows, cols, seed).
+    """
+    return lru_cache(maxsize=None)(_generate_maze_kruskal)
+
+
+@pytest.fixture(scope="session")
+def maze_factory():
+    """
+    Mazes with cycles keyed by (rows, cols, seed, extra_edges). They are
+    generated by every test session, so the tests always run the current
+    generator.
+    """
+
+    @lru_cache(maxsize=None)
+    def factory(rows, cols, seed, extra_edges=None):
+        return generate_maze(rows, cols, extra_edges=extra_edges, seed=seed)
+
+    return factory
+
+
+@pytest.fixture(scope="session")
+def graph_factory():
+    """
+    Random graphs with weighted edges keyed by the arguments
+    of generate_random_graph.
+    """
+    return lru_cache(maxsize=None)(generate_random_graph)
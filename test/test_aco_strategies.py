@@ -0,0 +1,34 @@
+"""
+Unit tests for aco_strategies module.
+"""
+
+import networkx as nx
+import numpy as np
+
+from src.aco_strategies import _select_move
+from src.graph_utils import convert_graph_to_csr
+
+
+# _select_move tests
+def test_select_move_zero_weights_uniform():
+    """Tests if the moves are uniform when all the weights are zero."""
+    csr = convert_graph_to_csr(nx.star_graph(4))
+    explored = np.zeros(csr.number_of_nodes, dtype=np.bool_)
+    explored[0] = True
+    n_draws = 400
+    moves = [
+        _select_move(
+            csr.indptr,
+            csr.indices,
+            csr.edge_ids,
+            np.ones(csr.number_of_nodes),
+            np.zeros(csr.number_of_edges),
+            explored,
+            0,
+            1.0,
+            (draw + 0.5) / n_draws,
+        )
+        for draw in range(n_draws)
+    ]
+    counts = np.bincount(moves, minlength=csr.number_of_nodes)
+    assert list(counts) == [0] + [n_draws // 4] * 4
@@ -0,0 +1,107 @@
+"""
+Unit tests for display_maze module.
+"""
+
+import os
+
+# the tests do not need a real window
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import networkx as nx  # noqa: E402
+import numpy as np  # noqa: E402
+import pygame  # noqa: E402
+
+from src.display_maze import Drawer  # noqa: E402
+from src.graph_generation import generate_maze  # noqa: E402
+from src.state_saver import StateWriter  # noqa: E402
+
+# antcolony.png is loaded from the root of the repository
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _reference_maze(drawer, maze):
+    """Draws the maze with one pygame.draw.line call per wall."""
+    size = drawer.cell_size
+    width, height = drawer.width, drawer.height
+    surface = pygame.surface.Surface((width, height)).convert()
+    surface.fill(pygame.Color("white"))
+    black = pygame.Color("black")
+    for u, v in nx.grid_2d_graph(drawer.rows, drawer.cols).edges():
+        if maze.has_edge(u, v):
+            continue
+        if u[0] == v[0]:
+            x1 = x2 = (u[1] + v[1]) * size / 2 + size / 2
+            y1 = (u[0] + v[0] - 1) * size / 2 + size / 2
+            y2 = y1 + size
+        else:
+            x1 = (u[1] + v[1] - 1) * size / 2 + size / 2
+            x2 = x1 + size
+            y1 = y2 = (u[0] + v[0]) * size / 2 + size / 2
+        pygame.draw.line(surface, black, (x1, y1), (x2, y2), 2)
+
+    border = int(size / 10)
+    for start, end in (
+        ((0, 0), (0, height - size)),
+        ((0, 0), (width, 0)),
+        ((0, height - 1), (width, height - 1)),
+        ((width - 1, size), (width - 1, height)),
+    ):
+        pygame.draw.line(surface, black, start, end, border)
+    return surface
+
+
+# Drawer._draw_maze tests
+def test_draw_maze_matches_lines(monkeypatch):
+    """Tests if the maze has the pixels of the walls drawn as lines."""
+    monkeypatch.chdir(ROOT_DIR)
+    rows, cols = 6, 9
+    maze = generate_maze(rows, cols, seed=4)
+    for cell_size in (20, 15):
+        drawer = Drawer(rows, cols, cell_size=cell_size, t_delta=0)
+        drawer.setup(maze)
+        expected = _reference_maze(drawer, maze)
+        assert np.array_equal(
+            pygame.surfarray.array3d(drawer.maze_surface),
+            pygame.surfarray.array3d(expected),
+        )
+    pygame.quit()
+
+
+# Drawer.draw tests
+def test_draw_presents_once_per_frame(monkeypatch, tmp_path):
+    """Tests if every frame is shown in the window exactly once."""
+    monkeypatch.chdir(ROOT_DIR)
+    rows, cols = 4, 5
+    paths = [[0, 1, 2], [0, 5, 10, 11, 12]]
+    file_path = str(tmp_path / "aco_state.jsonl")
+    with StateWriter(file_path) as writer:
+        for iteration in range(2):
+            writer.save_state(
+                iteration,
+                edges=np.array([(0, 1), (1, 2)]),
+                pheromone=np.array([1.0, 0.5]),
+                all_paths=[(path, len(path) - 1) for path in paths],
+                shortest_path=(paths[0], 2),
+            )
+
+    drawer = Drawer(rows, cols, cell_size=20, t_delta=0)
+    drawer.setup(generate_maze(rows, cols, seed=0))
+
+    frames = []
+    presents = []
+    draw_frame = drawer._draw_frame
+
+    def _draw_frame(paths, pheromones, iter):
+        frames.append(iter)
+        draw_frame(paths, pheromones, iter)
+
+    monkeypatch.setattr(drawer, "_draw_frame", _draw_frame)
+    monkeypatch.setattr(pygame.display, "flip", lambda: presents.append(1))
+    monkeypatch.setattr(
+        pygame.display, "update", lambda *args: presents.append(1)
+    )
+
+    drawer.draw(2, file_path=file_path)
+
+    assert frames == list(range(len(paths[1]))) * 2
+    assert len(presents) == len(frames)
@@ -0,0 +1,96 @@
+"""
+Unit tests for evaluation module.
+"""
+
+import networkx as nx
+import pytest
+
+from src import evaluation
+from src.evaluation import DIJKSTRA_CACHE_SIZE, cached_dijkstra_path
+from src.evaluation import compare_with_dijkstra
+from src.graph_utils import convert_graph_to_csr
+from src.path_finding import AntColonyOptimization
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache(monkeypatch):
+    monkeypatch.setattr(evaluation, "_dijkstra_cache", {})
+
+
+def _weighted_graph(seed):
+    graph = nx.gnp_random_graph(30, 0.2, seed=seed)
+    for u, v in graph.edges():
+        graph[u][v]["weight"] = (u * 7 + v * 3 + seed) % 10 + 1
+    return graph
+
+
+# cached_dijkstra_path tests
+@pytest.mark.parametrize("seed", range(5))
+def test_dijkstra_path_length(seed):
+    """Tests if the path is as short as NetworkX's shortest path."""
+    graph = _weighted_graph(seed)
+    end = max(nx.node_connected_component(graph, 0))
+    path = cached_dijkstra_path(graph, 0, end)
+    assert path[0] == 0
+    assert path[-1] == end
+    assert nx.path_weight(graph, path, "weight") == nx.dijkstra_path_length(
+        graph, 0, end
+    )
+
+
+def test_dijkstra_cache_hit():
+    """Tests if a repeated query returns the cached path."""
+    graph = convert_graph_to_csr(_weighted_graph(0))
+    first = cached_dijkstra_path(graph, 0, 5)
+    assert len(evaluation._dijkstra_cache) == 1
+    assert cached_dijkstra_path(graph, 0, 5) == first
+    assert len(evaluation._dijkstra_cache) == 1
+
+
+def test_dijkstra_cache_weight_change():
+    """Tests if changing a weight misses the cache."""
+    graph = nx.path_graph(4)
+    nx.set_edge_attributes(graph, 1, "weight")
+    graph.add_edge(0, 3, weight=5)
+    assert cached_dijkstra_path(graph, 0, 3) == [0, 1, 2, 3]
+
+    csr = convert_graph_to_csr(graph)
+    changed = convert_graph_to_csr(graph)
+    changed.weights[changed.edge_id(0, 3)] = 1
+    fingerprint = evaluation._graph_fingerprint
+    assert fingerprint(csr) != fingerprint(changed)
+    assert cached_dijkstra_path(changed, 0, 3) == [0, 3]
+    assert len(evaluation._dijkstra_cache) == 2
+
+
+def test_dijkstra_cache_eviction():
+    """Tests if the oldest paths are evicted from the full cache."""
+    graph = convert_graph_to_csr(nx.path_graph(DIJKSTRA_CACHE_SIZE + 2))
+    for end in range(1, DIJKSTRA_CACHE_SIZE + 2):
+        cached_dijkstra_path(graph, 0, end)
+    assert len(evaluation._dijkstra_cache) == DIJKSTRA_CACHE_SIZE
+    ends = [end for _, _, end in evaluation._dijkstra_cache]
+    assert ends == list(range(2, DIJKSTRA_CACHE_SIZE + 2))
+
+
+def test_dijkstra_no_path():
+    """Tests if an error is raised for disconnected nodes."""
+    graph = nx.Graph([(0, 1), (2, 3)])
+    with pytest.raises(nx.NetworkXNoPath):
+        cached_dijkstra_path(graph, 0, 3)
+
+
+# compare_with_dijkstra tests
+def test_compare_prints_list_without_iterations(tmp_path, capsys):
+    """Tests if the ACO path is printed when no iteration ran."""
+    graph = nx.path_graph(3)
+    aco = AntColonyOptimization(
+        graph,
+        n_ants=1,
+        n_best=1,
+        n_iterations=0,
+        decay=0.5,
+        filename=str(tmp_path / "aco_state.jsonl"),
+    )
+    compare_with_dijkstra(graph, 0, 2, aco)
+    assert "ACO shortest path: [0, 0]" in capsys.readouterr().out
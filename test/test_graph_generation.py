@@ -2,78 +2,156 @@
 Unit tests for graph_generation module.
 """
 
+import hashlib
+from hypothesis import given, settings
+from hypothesis import strategies as st
 import networkx as nx
+import numpy as np
 
-from src.graph_generation import _generate_maze_kruskal, generate_random_graph
-from src.graph_generation import generate_maze
+from src.graph_generation import generate_random_graph
+from src.graph_generation import generate_maze, generate_maze_cached
+from src.graph_generation import load_maze, save_maze
+
+from ._graph_utils import edges_connected, is_connected, is_tree
+
+# BLAKE2 digest of the sorted (u, v, weight) records of the graph
+# generate_random_graph(50, 0.3, seed=5) creates
+RANDOM_GRAPH_DIGEST = "b01b17a14e4a1942c4410e6ed7cbc187"
 
 
 # _generate_maze_kruskal tests
-def test_kruskal_connectivity():
+@settings(max_examples=25, deadline=None)
+@given(rows=st.integers(2, 8), cols=st.integers(2, 8))
+def test_kruskal_connectivity(kruskal_factory, rows, cols):
     """Tests if the maze is a connected graph."""
-    maze = _generate_maze_kruskal(5, 5)
-    assert nx.is_connected(maze)
+    maze = kruskal_factory(rows, cols, 0)
+    assert edges_connected(maze.edges, maze.number_of_nodes)
 
 
-def test_kruskal_no_cycles():
+@settings(max_examples=25, deadline=None)
+@given(rows=st.integers(2, 8), cols=st.integers(2, 8))
+def test_kruskal_no_cycles(kruskal_factory, rows, cols):
     """Tests if the maze has no cycles."""
-    maze = _generate_maze_kruskal(10, 9)
-    assert nx.is_tree(maze)
+    # a connected graph with one edge less than nodes is a tree
+    maze = kruskal_factory(rows, cols, 0)
+    assert len(maze.edges) == maze.number_of_nodes - 1
+    assert edges_connected(maze.edges, maze.number_of_nodes)
 
 
-def test_kruskal_dimensions():
+@settings(max_examples=25, deadline=None)
+@given(rows=st.integers(2, 8), cols=st.integers(2, 8))
+def test_kruskal_dimensions(kruskal_factory, rows, cols):
     """Tests if the maze has a correct number of nodes and edges"""
-    rows, cols = 10, 14
-    maze = _generate_maze_kruskal(rows, cols)
-    assert maze.number_of_nodes() == rows * cols
-    assert maze.number_of_edges() == maze.number_of_nodes() - 1
+    maze = kruskal_factory(rows, cols, 0)
+    assert maze.number_of_nodes == rows * cols
+    assert maze.edges.shape == (rows * cols - 1, 2)
+
+
+def test_kruskal_to_networkx(kruskal_factory):
+    """Tests if the NetworkX graph has the cells of the maze as nodes."""
+    rows, cols = 4, 6
+    maze = kruskal_factory(rows, cols, 0)
+    graph = maze.to_networkx()
+    assert set(graph.nodes()) == set(np.ndindex(rows, cols))
+    assert is_tree(graph)
 
 
 # generate_random_graph tests
-def test_number_of_nodes():
+def test_number_of_nodes(graph_factory):
     """Tests if the generated graph has the correct number of nodes."""
     n = 15
-    graph = generate_random_graph(n, 0.5)
+    graph = graph_factory(n, 0.5)
     assert graph.number_of_nodes() == n
 
 
-def test_edge_weights():
+def test_edge_weights(graph_factory):
     """Tests if the edge weights are within the specified range."""
     min_weight = 5
     max_weight = 20
-    graph = generate_random_graph(
+    graph = graph_factory(
         10, 0.5, min_weight=min_weight, max_weight=max_weight
     )
-    for _, _, w in graph.edges(data=True):
-        assert min_weight <= w["weight"] <= max_weight
+    weights = np.fromiter(
+        (w for _, _, w in graph.edges(data="weight")),
+        dtype=np.float64,
+        count=graph.number_of_edges(),
+    )
+    assert weights.min() >= min_weight
+    assert weights.max() <= max_weight
+
+
+def test_edge_weights_golden(graph_factory):
+    """Tests if a seeded graph has the same edges and weights as before."""
+    graph = graph_factory(50, 0.3, seed=5)
+    records = np.array(
+        sorted(graph.edges(data="weight")),
+        dtype=[("u", "<i4"), ("v", "<i4"), ("w", "<f8")],
+    )
+    digest = hashlib.blake2b(records.tobytes(), digest_size=16).hexdigest()
+    assert digest == RANDOM_GRAPH_DIGEST
+
+
+def test_edge_weights_seed():
+    """Tests if the same seed generates the same edge weights."""
+    first = generate_random_graph(20, 0.5, seed=3)
+    second = generate_random_graph(20, 0.5, seed=3)
+    assert list(first.edges(data="weight")) == list(
+        second.edges(data="weight")
+    )
 
 
 # generate_maze tests
-def test_maze_connectivity():
+def test_maze_connectivity(maze_factory):
     """Tests if the graph is a connected graph."""
-    maze = generate_maze(10, 10)
-    assert nx.is_connected(maze)
+    maze = maze_factory(10, 10, 0)
+    assert is_connected(maze)
 
 
-def test_maze_has_cycles():
+def test_maze_has_cycles(maze_factory):
     """Tests if the graph contains cycles."""
-    maze = generate_maze(20, 20)
-    assert not nx.is_tree(maze)
+    maze = maze_factory(20, 20, 0)
+    assert not is_tree(maze)
 
 
-def test_maze_dimensions():
+def test_maze_dimensions(maze_factory):
     """Tests if the graph has a correct number of nodes."""
     rows, cols = 6, 8
     extra = 5
-    maze = generate_maze(rows, cols, extra_edges=extra)
+    maze = maze_factory(rows, cols, 0, extra_edges=extra)
     assert maze.number_of_nodes() == rows * cols
 
 
-def test_maze_auto_edge_calculation():
+def test_maze_auto_edge_calculation(maze_factory):
     """
     Tests if the default value for the number of extra edges
     gives us a maze with cycles.
     """
     rows, cols = 15, 20
-    maze = generate_maze(rows, cols)
-    assert not nx.is_tree(maze)
+    maze = maze_factory(rows, cols, 0)
+    assert not is_tree(maze)
+
+
+def test_maze_seed_reproducibility():
+    """Tests if mazes generated with the same seed are identical."""
+    maze = generate_maze(12, 9, seed=7)
+    assert set(maze.edges()) == set(generate_maze(12, 9, seed=7).edges())
+
+
+# generate_maze_cached tests
+def test_maze_cached_matches_generated(tmp_path):
+    """Tests if the cached maze is the one generated for the seed."""
+    expected = generate_maze(7, 11, seed=3)
+    for _ in range(2):
+        maze = generate_maze_cached(7, 11, 3, cache_dir=str(tmp_path))
+        assert nx.utils.edges_equal(maze.edges(), expected.edges())
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+# save_maze / load_maze tests
+def test_maze_save_load_roundtrip(tmp_path):
+    """Tests if a saved maze is loaded with the same edges and shape."""
+    maze = generate_maze(5, 9, seed=11)
+    save_maze(str(tmp_path / "maze.npz"), maze, 5, 9)
+    loaded, rows, cols = load_maze(str(tmp_path / "maze.npz"))
+    assert (rows, cols) == (5, 9)
+    assert nx.utils.edges_equal(loaded.edges(), maze.edges())
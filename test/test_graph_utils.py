@@ -0,0 +1,112 @@
+"""
+Unit tests for graph_utils module.
+"""
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from src.graph_generation import generate_maze
+from src.graph_utils import convert_graph_to_csr, convert_grid_to_graph
+from src.graph_utils import node_tuple_to_int
+
+
+def _relabeled_edges(grid_graph, grid_width):
+    """Relabels the edges with node_tuple_to_int and sorts their ends."""
+    edges = set()
+    for u, v in grid_graph.edges():
+        ends = [node_tuple_to_int(node, grid_width) for node in (u, v)]
+        edges.add((min(ends), max(ends)))
+    return edges
+
+
+def _sorted_edges(graph):
+    return {(min(u, v), max(u, v)) for u, v in graph.edges()}
+
+
+# convert_grid_to_graph tests
+def test_grid_to_graph_relabels_nodes():
+    """Tests if the nodes are relabeled like node_tuple_to_int does."""
+    rows, cols = 5, 8
+    maze = generate_maze(rows, cols, seed=2)
+    graph = convert_grid_to_graph(maze)
+    assert set(graph.nodes()) == {
+        node_tuple_to_int(node, cols) for node in maze.nodes()
+    }
+    assert _sorted_edges(graph) == _relabeled_edges(maze, cols)
+
+
+def test_grid_to_graph_explicit_width():
+    """Tests if the given grid width is used for the integer ids."""
+    grid = nx.grid_2d_graph(3, 4)
+    graph = convert_grid_to_graph(grid, grid_width=6)
+    assert set(graph.nodes()) == {
+        node_tuple_to_int(node, 6) for node in grid.nodes()
+    }
+    assert _sorted_edges(graph) == _relabeled_edges(grid, 6)
+
+
+def test_grid_to_graph_sorted_ids():
+    """Tests if the nodes and edges are ordered by their integer ids."""
+    rows, cols = 4, 7
+    graph = convert_grid_to_graph(generate_maze(rows, cols, seed=5), cols)
+    assert list(graph.nodes()) == list(range(rows * cols))
+    edges = list(graph.edges())
+    assert all(u < v for u, v in edges)
+    assert edges == sorted(edges)
+    csr = convert_graph_to_csr(graph)
+    assert csr.edges.tolist() == [list(edge) for edge in edges]
+
+
+# convert_graph_to_csr tests
+def test_csr_neighbors():
+    """Tests if the neighbor lists match the adjacency of the graph."""
+    graph = nx.gnp_random_graph(20, 0.3, seed=1)
+    csr = convert_graph_to_csr(graph)
+    for node in graph.nodes():
+        start, stop = csr.indptr[node], csr.indptr[node + 1]
+        assert list(csr.indices[start:stop]) == sorted(graph[node])
+        assert csr.degree[node] == graph.degree(node)
+
+
+def test_csr_edge_ids():
+    """Tests if both directions of an edge share the same id."""
+    graph = nx.grid_2d_graph(4, 5)
+    graph = nx.convert_node_labels_to_integers(graph)
+    csr = convert_graph_to_csr(graph)
+    assert csr.number_of_edges == graph.number_of_edges()
+    for edge_id, (u, v) in enumerate(csr.edges):
+        assert csr.edge_id(u, v) == edge_id
+        assert csr.edge_id(v, u) == edge_id
+
+
+def test_csr_edge_ids_between():
+    """Tests if the ids of many edges are retrieved at once."""
+    graph = nx.gnp_random_graph(30, 0.2, seed=2)
+    csr = convert_graph_to_csr(graph)
+    u, v = csr.edges[::-1, 1], csr.edges[::-1, 0]
+    ids = csr.edge_ids_between(u, v)
+    assert list(ids) == list(range(csr.number_of_edges))[::-1]
+
+
+def test_csr_edge_ids_missing():
+    """Tests if the ids of edges between non-adjacent nodes are missing."""
+    csr = convert_graph_to_csr(nx.path_graph(4))
+    with pytest.raises(KeyError):
+        csr.edge_id(0, 2)
+    with pytest.raises(KeyError):
+        csr.edge_id(1, 7)
+    with pytest.raises(KeyError):
+        csr.edge_ids_between(np.array([0, 1]), np.array([1, 3]))
+
+
+def test_csr_to_scipy():
+    """Tests if the sparse matrix holds the weights of both directions."""
+    graph = nx.Graph()
+    graph.add_edge(0, 1, weight=3)
+    graph.add_edge(1, 2)
+    matrix = convert_graph_to_csr(graph).to_scipy().toarray()
+    assert (matrix == matrix.T).all()
+    assert matrix[0, 1] == 3
+    assert matrix[1, 2] == 1
+    assert matrix[0, 2] == 0
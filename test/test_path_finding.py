@@ -0,0 +1,123 @@
+"""
+Unit tests for path_finding module.
+"""
+
+import networkx as nx
+
+from src.aco_strategies import MoveSelectionStrategy
+from src.aco_strategies import PheromoneBasedMoveSelection
+from src.graph_utils import convert_grid_to_graph
+from src.path_finding import AntColonyOptimization
+
+
+class GenericMoveSelection(PheromoneBasedMoveSelection):
+    """Uses the select_move driven DFS of the base strategy."""
+
+    construct_path = MoveSelectionStrategy.construct_path
+
+
+def _run_aco(monkeypatch, tmp_path, maze_factory, **kwargs):
+    monkeypatch.chdir(tmp_path)
+    rows, cols = 8, 8
+    graph = convert_grid_to_graph(maze_factory(rows, cols, 0), cols)
+    aco = AntColonyOptimization(
+        graph,
+        n_ants=5,
+        n_best=2,
+        n_iterations=3,
+        decay=0.5,
+        filename="data/aco_state.jsonl",
+        **kwargs,
+    )
+    start, end = (rows - 1) * cols, cols - 1
+    return graph, start, end, aco.run(start, end)
+
+
+def _assert_valid_path(graph, start, end, path, length):
+    assert path[0] == start
+    assert path[-1] == end
+    assert length == len(path) - 1
+    assert length >= nx.shortest_path_length(graph, start, end)
+    for u, v in zip(path[:-1], path[1:]):
+        assert graph.has_edge(u, v)
+
+
+def test_aco_finds_valid_path(monkeypatch, tmp_path, maze_factory):
+    """Tests if the path found by ACO connects the start and end nodes."""
+    graph, start, end, (path, length) = _run_aco(
+        monkeypatch, tmp_path, maze_factory
+    )
+    _assert_valid_path(graph, start, end, path, length)
+
+
+def test_aco_generic_move_selection(monkeypatch, tmp_path, maze_factory):
+    """Tests if a strategy providing only select_move finds a valid path."""
+    graph, start, end, (path, length) = _run_aco(
+        monkeypatch,
+        tmp_path,
+        maze_factory,
+        move_selection_strategy=GenericMoveSelection(),
+    )
+    _assert_valid_path(graph, start, end, path, length)
+
+
+def test_aco_seed_reproducibility(monkeypatch, tmp_path, maze_factory):
+    """Tests if strategies seeded with the same seed find the same path."""
+    results = [
+        _run_aco(
+            monkeypatch,
+            tmp_path,
+            maze_factory,
+            move_selection_strategy=PheromoneBasedMoveSelection(seed=4),
+        )[3]
+        for _ in range(2)
+    ]
+    assert list(results[0][0]) == list(results[1][0])
+
+
+def test_generic_construct_path_long(tmp_path):
+    """Tests if paths longer than the recursion limit are constructed."""
+    graph = nx.path_graph(5000)
+    aco = AntColonyOptimization(
+        graph,
+        n_ants=1,
+        n_best=1,
+        n_iterations=1,
+        decay=0.5,
+        filename=str(tmp_path / "aco_state.jsonl"),
+        move_selection_strategy=GenericMoveSelection(),
+    )
+    path, length = aco.run(0, 4999)
+    assert list(path) == list(range(5000))
+    assert length == 4999
+
+
+def test_aco_start_is_end(tmp_path):
+    """Tests if the path from a node to itself has no edges."""
+    aco = AntColonyOptimization(
+        nx.path_graph(4),
+        n_ants=2,
+        n_best=2,
+        n_iterations=2,
+        decay=0.5,
+        filename=str(tmp_path / "aco_state.jsonl"),
+    )
+    path, length = aco.run(2, 2)
+    assert list(path) == [2]
+    assert length == 0
+
+
+def test_aco_unreachable_end(tmp_path):
+    """Tests if an empty path is found when the end is unreachable."""
+    graph = nx.Graph([(0, 1), (1, 2), (3, 4)])
+    aco = AntColonyOptimization(
+        graph,
+        n_ants=3,
+        n_best=2,
+        n_iterations=2,
+        decay=0.5,
+        filename=str(tmp_path / "aco_state.jsonl"),
+    )
+    path, length = aco.run(0, 4)
+    assert list(path) == []
+    assert length == -1
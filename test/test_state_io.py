@@ -0,0 +1,158 @@
+"""
+Unit tests for state_saver and state_loader modules.
+"""
+
+import numpy as np
+import orjson
+import pytest
+
+from src.state_loader import load_all_states, load_state_by_iteration
+from src.state_saver import LEVEL_DTYPE, StateWriter
+
+# The levels are saved in LEVEL_DTYPE, so they are restored up to its
+# rounding error
+LEVEL_TOLERANCE = np.finfo(LEVEL_DTYPE).eps
+
+
+def _write_states(file_path, n_iterations, keyframe_interval, n_edges=50):
+    """Saves states with evaporating pheromone and a few deposits."""
+    rng = np.random.default_rng(0)
+    edges = np.array([(i, i + 1) for i in range(n_edges)])
+    pheromone = np.ones(len(edges))
+    expected = []
+    with StateWriter(file_path, keyframe_interval=keyframe_interval) as w:
+        for iteration in range(n_iterations):
+            pheromone *= 0.9
+            pheromone[rng.integers(0, len(edges), size=3)] += 0.1
+            path = [0, 1, 2]
+            w.save_state(iteration, edges, pheromone, [(path, 2)], (path, 2))
+            expected.append(
+                {f"{u}-{v}": p for (u, v), p in zip(edges, pheromone)}
+            )
+    return expected
+
+
+def _assert_levels(pheromone, expected):
+    """Checks if levels keyed by edges are the expected ones."""
+    assert list(pheromone) == list(expected)
+    np.testing.assert_allclose(
+        list(pheromone.values()),
+        list(expected.values()),
+        rtol=LEVEL_TOLERANCE,
+        atol=0,
+    )
+
+
+def test_states_roundtrip(tmp_path):
+    """
+    Tests if the states saved as deltas are restored up to the relative
+    rounding error of LEVEL_DTYPE.
+    """
+    file_path = tmp_path / "states.jsonl"
+    expected = _write_states(file_path, 12, keyframe_interval=5)
+    states = load_all_states(file_path)
+    assert [s["iteration"] for s in states] == list(range(12))
+    for state, levels in zip(states, expected):
+        _assert_levels(state["pheromone"], levels)
+    state = load_state_by_iteration(file_path, 8)
+    assert state["pheromone"] == states[8]["pheromone"]
+
+
+def test_states_long_delta_chain(tmp_path):
+    """
+    Tests if the rounding errors do not add up over many states saved
+    as deltas after a single keyframe.
+    """
+    file_path = tmp_path / "states.jsonl"
+    n_iterations = 200
+    expected = _write_states(file_path, n_iterations, n_iterations)
+    lines = file_path.read_bytes().splitlines()
+    assert sum(b'"pheromone_levels":' in line for line in lines) == 1
+    for state, levels in zip(load_all_states(file_path), expected):
+        _assert_levels(state["pheromone"], levels)
+
+
+def test_states_loaded_by_iteration(tmp_path):
+    """Tests if every state is restored when loaded by its iteration."""
+    file_path = tmp_path / "states.jsonl"
+    expected = _write_states(file_path, 12, keyframe_interval=5)
+    for iteration in reversed(range(12)):
+        state = load_state_by_iteration(file_path, iteration)
+        assert state["iteration"] == iteration
+        _assert_levels(state["pheromone"], expected[iteration])
+    with pytest.raises(ValueError):
+        load_state_by_iteration(file_path, 12)
+
+
+def test_states_store_deltas(tmp_path):
+    """Tests if the states between keyframes store only the changes."""
+    with_deltas = tmp_path / "deltas.jsonl"
+    keyframes_only = tmp_path / "keyframes.jsonl"
+    # with more edges the levels outweigh the paths saved in every state
+    _write_states(with_deltas, 10, keyframe_interval=10, n_edges=500)
+    _write_states(keyframes_only, 10, keyframe_interval=1, n_edges=500)
+    assert with_deltas.stat().st_size < keyframes_only.stat().st_size / 2
+
+
+def test_states_edges_saved_once(tmp_path):
+    """Tests if the edges are saved only in the header line."""
+    file_path = tmp_path / "states.jsonl"
+    _write_states(file_path, 12, keyframe_interval=5)
+    records = [orjson.loads(line) for line in file_path.read_bytes().split()]
+    assert list(records[0]) == ["pheromone_edges"]
+    assert all("pheromone_edges" not in r for r in records[1:])
+
+
+def test_states_pheromone_arrays(tmp_path):
+    """Tests if the pheromone levels are loaded as arrays."""
+    file_path = tmp_path / "states.jsonl"
+    expected = _write_states(file_path, 12, keyframe_interval=5)
+    state = load_state_by_iteration(file_path, 7, pheromone_arrays=True)
+    edges, levels = state["pheromone"]
+    assert edges.tolist() == [[i, i + 1] for i in range(50)]
+    assert levels.dtype == LEVEL_DTYPE
+    _assert_levels(
+        {f"{u}-{v}": p for (u, v), p in zip(edges.tolist(), levels)},
+        expected[7],
+    )
+
+
+def test_states_keyed_by_strings(tmp_path):
+    """Tests if the states with levels keyed by "u-v" strings are loaded."""
+    file_path = tmp_path / "states.jsonl"
+    pheromone = {"0-1": 0.5, "1-2": 0.25}
+    file_path.write_bytes(
+        orjson.dumps(
+            {
+                "iteration": 0,
+                "all_paths": [{"path": [0, 1, 2], "length": 2}],
+                "shortest_path": {"path": [0, 1, 2], "length": 2},
+                "pheromone": pheromone,
+            }
+        )
+        + b"\n"
+    )
+    assert load_state_by_iteration(file_path, 0)["pheromone"] == pheromone
+
+
+def test_state_writer_raises_first_error(tmp_path):
+    """Tests if an error of an earlier write is raised by close."""
+    writer = StateWriter(tmp_path / "states.jsonl")
+    write = writer._file.write
+    calls = []
+
+    def failing_write(data):
+        calls.append(data)
+        if len(calls) == 1:
+            raise OSError("disk full")
+        return write(data)
+
+    writer._file.write = failing_write
+    edges = np.array([(0, 1), (1, 2)])
+    for iteration in range(3):
+        writer.save_state(
+            iteration, edges, np.ones(2), [([0, 1], 1)], ([0, 1], 1)
+        )
+    with pytest.raises(OSError, match="disk full"):
+        writer.close()
+    assert len(calls) == 3